@@ -0,0 +1,54 @@
+"""
+Alembic environment wired to the application's engine and metadata
+
+Fresh databases are still provisioned by create_all at startup; these
+migrations exist to bring databases created before the performance work
+up to the current schema. Run with: alembic upgrade head
+"""
+import os
+import sys
+from logging.config import fileConfig
+
+from alembic import context
+
+# The alembic console script does not put the project root on sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.database.connection import engine
+from app.models.load import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit migration SQL without a live connection"""
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against the application's engine"""
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
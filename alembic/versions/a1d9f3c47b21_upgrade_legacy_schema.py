@@ -0,0 +1,122 @@
+"""Upgrade pre-performance-work databases to the current schema
+
+Brings a database created by the original create_all schema up to the
+current models: the denormalized negotiation thresholds, the query
+indexes, the SQLEnum->String data format (legacy rows stored enum
+member NAMES; the string columns and response validators expect the
+lowercase values) and, on Postgres, the JSONB column types with their
+GIN indexes.
+
+Every step is guarded against already-current databases, so running
+`alembic upgrade head` on a freshly create_all-provisioned database is
+a no-op. SQLite cannot add CHECK constraints to existing tables without
+a rebuild; fresh databases get them from create_all, and the data fixes
+here make legacy rows conform regardless.
+
+Revision ID: a1d9f3c47b21
+Revises:
+Create Date: 2026-09-01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a1d9f3c47b21"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _ensure_index(inspector, table, name, columns, **kw):
+    if name not in {index["name"] for index in inspector.get_indexes(table)}:
+        op.create_index(name, table, columns, **kw)
+
+
+def _drop_index_if_present(inspector, table, name):
+    if name in {index["name"] for index in inspector.get_indexes(table)}:
+        op.drop_index(name, table_name=table)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    is_postgres = bind.dialect.name == "postgresql"
+
+    # --- negotiations: denormalized acceptance thresholds (chunk4-10) ---
+    negotiation_columns = {column["name"] for column in inspector.get_columns("negotiations")}
+    if "min_acceptable_rate" not in negotiation_columns:
+        op.add_column("negotiations", sa.Column("min_acceptable_rate", sa.DECIMAL(10, 2), nullable=True))
+        op.add_column("negotiations", sa.Column("final_round_min_rate", sa.DECIMAL(10, 2), nullable=True))
+        op.execute(
+            "UPDATE negotiations SET "
+            "min_acceptable_rate = original_rate * 0.95, "
+            "final_round_min_rate = original_rate * 0.90"
+        )
+
+    if is_postgres:
+        # Column types first: the legacy columns are native enum types, on
+        # which the lower() rewrite below would fail (and its output would
+        # not be a valid label anyway). enum -> varchar, JSON/TEXT -> JSONB
+        # (chunk1-11 / chunk2-18 / chunk1-14 / chunk2-9). On SQLite the
+        # storage class is TEXT throughout, so nothing to alter.
+        op.execute("ALTER TABLE calls ALTER COLUMN outcome TYPE VARCHAR(32) USING outcome::text")
+        op.execute("ALTER TABLE calls ALTER COLUMN sentiment TYPE VARCHAR(16) USING sentiment::text")
+        op.execute("ALTER TABLE negotiations ALTER COLUMN status TYPE VARCHAR(16) USING status::text")
+        op.execute(
+            "ALTER TABLE negotiations ALTER COLUMN current_offer_type TYPE VARCHAR(16) "
+            "USING current_offer_type::text"
+        )
+        op.execute(
+            "ALTER TABLE calls ALTER COLUMN extracted_data TYPE JSONB USING extracted_data::jsonb"
+        )
+        op.execute(
+            "ALTER TABLE carriers ALTER COLUMN equipment_types TYPE JSONB USING equipment_types::jsonb"
+        )
+        # Nothing references the SQLEnum-created types once the columns are varchar
+        op.execute("DROP TYPE IF EXISTS calloutcome")
+        op.execute("DROP TYPE IF EXISTS callsentiment")
+        op.execute("DROP TYPE IF EXISTS negotiationstatus")
+        op.execute("DROP TYPE IF EXISTS offertype")
+
+    # --- enum data: legacy SQLEnum rows stored member NAMES ---
+    # (chunk1-11 / chunk2-18); values are the lowercased names
+    op.execute("UPDATE calls SET outcome = lower(outcome) WHERE outcome IS NOT NULL")
+    op.execute("UPDATE calls SET sentiment = lower(sentiment) WHERE sentiment IS NOT NULL")
+    op.execute("UPDATE negotiations SET status = lower(status) WHERE status IS NOT NULL")
+    op.execute(
+        "UPDATE negotiations SET current_offer_type = lower(current_offer_type) "
+        "WHERE current_offer_type IS NOT NULL"
+    )
+
+    # --- indexes matching the current query patterns ---
+    # (chunk0-18 / chunk1-7 / chunk2-2 / chunk3-6 / chunk4-3)
+    _ensure_index(inspector, "calls", "ix_calls_start_time", ["start_time"])
+    _ensure_index(inspector, "calls", "ix_calls_carrier_mc_start_time",
+                  ["carrier_mc_number", "start_time"])
+    _ensure_index(inspector, "calls", "ix_calls_outcome_start_time", ["outcome", "start_time"])
+    _ensure_index(inspector, "calls", "ix_calls_sentiment", ["sentiment"])
+    _ensure_index(inspector, "calls", "ix_calls_discussed_load_id", ["discussed_load_id"])
+    _drop_index_if_present(inspector, "calls", "ix_calls_carrier_mc_number")
+
+    _ensure_index(inspector, "loads", "ix_loads_match",
+                  ["is_available", "equipment_type", "loadboard_rate"],
+                  postgresql_where=sa.text("is_available = true"))
+    _ensure_index(inspector, "loads", "ix_loads_pickup_datetime", ["pickup_datetime"])
+
+    _ensure_index(inspector, "negotiations", "ix_negotiations_call_id_status",
+                  ["call_id", "status"])
+    _ensure_index(inspector, "negotiations", "ix_negotiations_status_expires_at",
+                  ["status", "expires_at"])
+
+    if is_postgres:
+        _ensure_index(inspector, "calls", "ix_calls_extracted_data_gin",
+                      ["extracted_data"], postgresql_using="gin")
+        _ensure_index(inspector, "carriers", "ix_carriers_equipment_types_gin",
+                      ["equipment_types"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    raise NotImplementedError("Downgrading to the pre-performance-work schema is not supported")
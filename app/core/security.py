@@ -1,29 +1,35 @@
-from fastapi import HTTPException, Security, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+"""
+API-key auth helpers shared by the middleware and outbound HappyRobot calls
+"""
+import hmac
+from functools import lru_cache
+from typing import Optional
+
 from app.core.config import settings
 
+__all__ = ["is_authorized", "create_api_key_header"]
 
-security = HTTPBearer()
+# Captured once at import time: avoids a Pydantic settings attribute lookup on
+# every request, and compare_digest keeps the comparison constant-time
+_API_KEY = settings.api_key
+_API_KEY_BYTES = settings.api_key.encode()
 
 
-async def verify_api_key(credentials: HTTPAuthorizationCredentials = Security(security)):
-    if not credentials:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header"
-        )
-    
-    if credentials.credentials != settings.api_key:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid API key"
-        )
-    
-    return True
+def is_authorized(authorization: Optional[str]) -> bool:
+    """Check a raw Authorization header value against the configured API key"""
+    if authorization is None or not authorization.startswith("Bearer "):
+        return False
+    # Compare as bytes: compare_digest raises TypeError on non-ASCII str
+    # input, and header values arrive latin-1-decoded, so a garbage token
+    # must come out as a 401, not a 500
+    return hmac.compare_digest(authorization[7:].encode("latin-1", "replace"), _API_KEY_BYTES)
 
 
+@lru_cache(maxsize=1)
 def create_api_key_header():
+    # The key is fixed per process; rebuild via cache_clear() on rotation.
+    # Callers treat the returned dict as read-only.
     return {
-        "Authorization": f"Bearer {settings.api_key}",
+        "Authorization": f"Bearer {_API_KEY}",
         "Content-Type": "application/json"
-    }
\ No newline at end of file
+    }
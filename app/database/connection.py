@@ -1,23 +1,58 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import StaticPool
 from app.core.config import settings
 from app.models.load import Base
 from app.models.carrier import Carrier
 from app.models.call import Call
 from app.models.negotiation import Negotiation
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+# Create database engine with explicit pool sizing so concurrent requests
+# don't exhaust the default 5-connection pool and queue up behind each other
+_is_sqlite = "sqlite" in settings.database_url
 
-# Create SessionLocal class for database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_engine_kwargs = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_pre_ping": settings.db_pool_pre_ping,
+    "pool_recycle": settings.db_pool_recycle,
+    "query_cache_size": 1200,  # keep hot statement compilations in the LRU
+}
+if _is_sqlite:
+    _engine_kwargs["connect_args"] = {"check_same_thread": False}
+    if ":memory:" in settings.database_url:
+        # Every session must share the one in-memory connection or each
+        # would see an empty database
+        _engine_kwargs["poolclass"] = StaticPool
+        for key in ("pool_size", "max_overflow", "pool_timeout"):
+            del _engine_kwargs[key]
+
+engine = create_engine(settings.database_url, **_engine_kwargs)
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets the webhook writers proceed alongside readers, and
+        # synchronous=NORMAL drops the per-commit fsync that serializes
+        # the default rollback-journal mode
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+# Create SessionLocal class for database sessions. expire_on_commit=False
+# keeps loaded attributes usable after commit instead of re-SELECTing the
+# row the first time a response serializer touches it.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
 def create_tables():
@@ -42,24 +77,36 @@ def get_database():
 def init_database():
     """Initialize database with sample data"""
     create_tables()
-    
+
+    if not settings.seed_on_startup:
+        return
+
     # Add sample loads for testing
+    from app.models.load import Load, LoadCreate
     from app.services.load_service import LoadService
-    from app.models.load import LoadCreate
     from datetime import datetime, timedelta
     from decimal import Decimal
-    
+
     db = SessionLocal()
-    load_service = LoadService(db)
-    
+
+    # One timestamp for the whole sample set, in UTC to match the
+    # datetime.utcnow column defaults
+    now = datetime.utcnow()
+
+    # Already-populated databases skip the sample-building work entirely,
+    # keeping multi-worker restarts cheap
+    if db.query(Load.load_id).limit(1).first() is not None:
+        db.close()
+        return
+
     # Sample loads data
     sample_loads = [
         LoadCreate(
             load_id="LD001",
             origin="Los Angeles, CA",
             destination="Phoenix, AZ",
-            pickup_datetime=datetime.now() + timedelta(days=2),
-            delivery_datetime=datetime.now() + timedelta(days=3),
+            pickup_datetime=now + timedelta(days=2),
+            delivery_datetime=now + timedelta(days=3),
             equipment_type="Dry Van",
             loadboard_rate=Decimal("1500.00"),
             notes="Standard dry freight, no hazmat",
@@ -73,8 +120,8 @@ def init_database():
             load_id="LD002", 
             origin="Dallas, TX",
             destination="Atlanta, GA",
-            pickup_datetime=datetime.now() + timedelta(days=1),
-            delivery_datetime=datetime.now() + timedelta(days=4),
+            pickup_datetime=now + timedelta(days=1),
+            delivery_datetime=now + timedelta(days=4),
             equipment_type="Reefer",
             loadboard_rate=Decimal("2200.00"),
             notes="Temperature controlled, -10°F",
@@ -88,8 +135,8 @@ def init_database():
             load_id="LD003",
             origin="Chicago, IL", 
             destination="Denver, CO",
-            pickup_datetime=datetime.now() + timedelta(days=3),
-            delivery_datetime=datetime.now() + timedelta(days=5),
+            pickup_datetime=now + timedelta(days=3),
+            delivery_datetime=now + timedelta(days=5),
             equipment_type="Flatbed",
             loadboard_rate=Decimal("1800.00"),
             notes="Steel beams, tarps required",
@@ -102,11 +149,10 @@ def init_database():
     ]
     
     try:
-        for load_data in sample_loads:
-            existing = load_service.get_load(load_data.load_id)
-            if not existing:
-                load_service.create_load(load_data)
-        
+        # One batched existence check + one multi-row INSERT via the
+        # service's bulk path
+        LoadService(db).create_loads(sample_loads)
+
         print("Database initialized with sample data")
     except Exception as e:
         print(f"Error initializing sample data: {e}")
@@ -0,0 +1,23 @@
+"""
+Dialect-aware INSERT helpers for the bulk write paths
+"""
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def insert_ignoring_conflicts(session, model, rows, index_elements):
+    """
+    Multi-row INSERT ... ON CONFLICT DO NOTHING for the session's dialect.
+
+    Closes the race between a batch's existence pre-check and its INSERT:
+    a duplicate key landing in between is skipped instead of aborting the
+    whole batch with an IntegrityError. Both SQLite and Postgres support
+    the clause natively.
+    """
+    if not rows:
+        return
+    dialect_insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    session.execute(
+        dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements),
+        rows,
+    )
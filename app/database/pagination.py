@@ -0,0 +1,31 @@
+"""
+Pagination helpers for list queries
+"""
+from sqlalchemy import func
+
+
+def paginate(query, skip: int, limit: int):
+    """
+    Apply skip/limit pagination and fetch the total row count in the
+    same round-trip via count(*) OVER(), instead of a separate COUNT query.
+
+    Args:
+        query: Entity query to paginate
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+
+    Returns:
+        tuple: (rows, total) where total counts all rows matching the query
+    """
+    rows = (query
+            .add_columns(func.count().over().label("total"))
+            .offset(skip)
+            .limit(limit)
+            .all())
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+    if skip:
+        # The page ran past the end, taking the window count with it;
+        # fall back to a COUNT so the total still reflects the collection
+        return [], query.order_by(None).count()
+    return [], 0
@@ -1,20 +1,43 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from sqlalchemy.orm import Session
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
+from app.core.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+import asyncio
 import uvicorn
+import orjson
 import structlog
 from contextlib import asynccontextmanager
 import os
 
+from app.core.caching import capture_event_loop
 from app.core.config import settings
-from app.database.connection import init_database
+from app.core.security import is_authorized
+from app.database.connection import SessionLocal, get_database, init_database
+from app.services.call_service import CallService
+from app.services.happyrobot_service import HappyRobotService
+from app.services.negotiation_service import NegotiationService
 from app.api import loads, carriers, calls, negotiations
 
+def _orjson_serializer(obj, **kwargs):
+    return orjson.dumps(obj, default=str).decode()
+
+
 structlog.configure(
-    processors=[
-        structlog.dev.ConsoleRenderer(colors=True)
-    ],
+    processors=(
+        # Machine-readable JSON via orjson in production; pretty console
+        # rendering (ANSI + dict repr) is far hotter per log line
+        [
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.JSONRenderer(serializer=_orjson_serializer),
+        ]
+        if settings.environment == "production"
+        else [structlog.dev.ConsoleRenderer(colors=True)]
+    ),
     wrapper_class=structlog.make_filtering_bound_logger(30 if settings.environment == "production" else 10),
     context_class=dict,
     logger_factory=structlog.PrintLoggerFactory(),
@@ -24,15 +47,60 @@ structlog.configure(
 logger = structlog.get_logger()
 
 
+_NEGOTIATION_SWEEP_INTERVAL_SECONDS = 60
+
+
+async def _expire_negotiations_periodically():
+    # Keeps the table sweep off user-facing requests; each run is a single
+    # indexed bulk UPDATE on a short-lived session
+    while True:
+        await asyncio.sleep(_NEGOTIATION_SWEEP_INTERVAL_SECONDS)
+        try:
+            db = SessionLocal()
+            try:
+                expired_count = await run_in_threadpool(
+                    NegotiationService(db).cleanup_expired_negotiations
+                )
+                if expired_count:
+                    logger.info("Expired negotiations", count=expired_count)
+            finally:
+                db.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Negotiation expiry sweep failed", error=str(e))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting HappyRobot Inbound Carrier Sales API", environment=settings.environment)
     
     init_database()
     logger.info("Database initialized")
-    
+
+    # Response cache for hot idempotent GETs: Redis when configured,
+    # otherwise a per-process in-memory backend so dev needs no extra
+    # service. With multiple workers the in-memory backend cannot share
+    # hits or invalidation between processes - set redis_url in production.
+    if settings.redis_url:
+        from redis import asyncio as aioredis
+        from fastapi_cache.backends.redis import RedisBackend
+        cache_backend = RedisBackend(aioredis.from_url(settings.redis_url))
+    else:
+        cache_backend = InMemoryBackend()
+    FastAPICache.init(cache_backend, prefix="hr-cache")
+    capture_event_loop()
+    logger.info("Response cache initialized", backend=type(cache_backend).__name__)
+
+    # One HappyRobot client for the process instead of one per request
+    app.state.happyrobot = HappyRobotService()
+
+    sweep_task = asyncio.create_task(_expire_negotiations_periodically())
+
     yield
-    
+
+    sweep_task.cancel()
+    await app.state.happyrobot.aclose()
     logger.info("Shutting down HappyRobot Inbound Carrier Sales API")
 
 
@@ -55,12 +123,47 @@ app = FastAPI(
     All endpoints require Bearer token authentication via the `Authorization` header.
     """,
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# API paths that intentionally stay open (dashboard polling and test helpers)
+_AUTH_EXEMPT_API_PATHS = (
+    "/api/v1/calls/analytics/dashboard",
+    "/api/v1/calls/dashboard/recent",
+    "/api/v1/test/",
+)
+
+
+@app.middleware("http")
+async def require_api_key(request: Request, call_next):
+    # One header check per request instead of resolving the verify_api_key
+    # dependency through FastAPI's DI machinery in every handler
+    path = request.url.path
+    if path.startswith("/api/v1/") and not path.startswith(_AUTH_EXEMPT_API_PATHS):
+        authorization = request.headers.get("authorization")
+        if not is_authorized(authorization):
+            detail = "Invalid API key" if authorization else "Missing authorization header"
+            return ORJSONResponse({"detail": detail}, status_code=401)
+    return await call_next(request)
+
+
+# Browser traffic only ever hits the API and dashboard routes; webhook and
+# probe paths skip CORS processing entirely
+_CORS_SKIP_PREFIXES = ("/webhook", "/health")
+
+
+class SelectiveCORSMiddleware(CORSMiddleware):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(_CORS_SKIP_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"] if settings.debug else ["https://yourdomain.com"],
+    SelectiveCORSMiddleware,
+    allow_origins=frozenset({"*"}) if settings.debug else frozenset({"https://yourdomain.com"}),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -85,13 +188,14 @@ async def root():
     }
 
 
+# Probes hit /health every few seconds; the body never changes, so it is
+# serialized exactly once (the old payload carried a hardcoded stale timestamp)
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "environment": settings.environment})
+
+
 @app.get("/health")
 async def health_check():
-    return {
-        "status": "healthy",
-        "environment": settings.environment,
-        "timestamp": "2025-09-07T00:00:00Z"
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/dashboard")
@@ -103,58 +207,82 @@ async def dashboard():
         raise HTTPException(status_code=404, detail="Dashboard not found")
 
 
+# Transcripts run tens of KB; anything near a megabyte is not a call event
+_WEBHOOK_MAX_BODY_BYTES = 1_000_000
+
+
+async def _on_call_started(payload: dict, db: Session):
+    logger.info("Processing call started event",
+                call_id=payload.get("call_data", {}).get("call_id"))
+
+
+async def _on_call_completed(payload: dict, db: Session):
+    logger.info("Processing call completed event",
+               call_id=payload.get("call_data", {}).get("happyrobot_call_id"))
+
+    try:
+        call_service = CallService(db)
+        result = await run_in_threadpool(call_service.process_happyrobot_webhook, payload)
+        logger.info("Webhook processing result", success=result is not None)
+    except Exception as db_error:
+        logger.error("Database processing failed", error=str(db_error))
+
+
+async def _on_call_transcript(payload: dict, db: Session):
+    logger.info("Processing transcript event",
+                call_id=payload.get("call_data", {}).get("call_id"))
+
+
+async def _on_unknown_event(payload: dict, db: Session):
+    logger.warning("Unknown webhook event type", event_type=payload.get("event_type"))
+
+
+# Dispatch table: one dict probe per webhook, and new event types are an
+# entry here rather than another elif branch
+_WEBHOOK_EVENT_HANDLERS = {
+    "call_started": _on_call_started,
+    "call_ended": _on_call_completed,
+    "call_completed": _on_call_completed,
+    "call_transcript": _on_call_transcript,
+}
+
+
 @app.post("/webhook/happyrobot")
-async def happyrobot_webhook(request: Request):
+async def happyrobot_webhook(request: Request, db: Session = Depends(get_database)):
+    # Reject oversized bodies before buffering or logging anything; the
+    # declared length is checked first so abusive posts fail without a read
+    content_length = int(request.headers.get("content-length") or 0)
+    if content_length > _WEBHOOK_MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="Webhook payload too large")
+
+    body = await request.body()
+    if len(body) > _WEBHOOK_MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="Webhook payload too large")
+
     try:
-        payload = await request.json()
-        
-        logger.info("Received HappyRobot webhook", payload=payload)
-        
+        # orjson parses the (potentially transcript-heavy) body several
+        # times faster than Starlette's stdlib json path
+        payload = orjson.loads(body)
+
         event_type = payload.get("event_type")
-        call_data = payload.get("call_data", {})
-        
-        if event_type == "call_started":
-            logger.info("Processing call started event", call_id=call_data.get("call_id"))
-            
-        elif event_type == "call_ended" or event_type == "call_completed":
-            logger.info("Processing call completed event", 
-                       call_id=call_data.get("happyrobot_call_id"),
-                       payload_keys=list(payload.keys()),
-                       call_data_keys=list(call_data.keys()))
-            
-            try:
-                from app.services.call_service import CallService
-                from app.database.connection import SessionLocal
-                
-                db = SessionLocal()
-                try:
-                    call_service = CallService(db)
-                    result = await call_service.process_happyrobot_webhook(payload)
-                    logger.info("Webhook processing result", success=result is not None)
-                finally:
-                    db.close()
-                    
-            except Exception as db_error:
-                logger.error("Database processing failed", error=str(db_error))
-            
-        elif event_type == "call_transcript":
-            logger.info("Processing transcript event", call_id=call_data.get("call_id"))
-            
-        else:
-            logger.warning("Unknown webhook event type", event_type=event_type)
-        
+
+        # Log metadata only; transcript-bearing payloads run to many KB
+        logger.info("Received HappyRobot webhook", event_type=event_type)
+
+        await _WEBHOOK_EVENT_HANDLERS.get(event_type, _on_unknown_event)(payload, db)
+
         return {"status": "received", "event_type": event_type}
         
     except Exception as e:
-        logger.error("Error processing webhook", 
-                    error=str(e), 
+        logger.error("Error processing webhook",
+                    error=str(e),
                     error_type=type(e).__name__,
-                    payload=payload if 'payload' in locals() else "no_payload")
+                    payload_keys=list(payload.keys()) if 'payload' in locals() else "no_payload")
         return {"status": "error", "message": str(e), "event_type": payload.get("event_type") if 'payload' in locals() else "unknown"}
 
 
 @app.post("/api/v1/test/webhook")
-async def test_webhook_processing():
+async def test_webhook_processing(db: Session = Depends(get_database)):
     try:
         test_payload = {
             "event_type": "call_completed",
@@ -175,16 +303,9 @@ async def test_webhook_processing():
             }
         }
         
-        from app.services.call_service import CallService
-        from app.database.connection import SessionLocal
-        
-        db = SessionLocal()
-        try:
-            call_service = CallService(db)
-            result = await call_service.process_happyrobot_webhook(test_payload)
-        finally:
-            db.close()
-        
+        call_service = CallService(db)
+        result = await run_in_threadpool(call_service.process_happyrobot_webhook, test_payload)
+
         return {
             "status": "success",
             "message": "Test call data created",
@@ -196,12 +317,10 @@ async def test_webhook_processing():
         raise HTTPException(status_code=500, detail=f"Test failed: {str(e)}")
 
 @app.post("/api/v1/test/web-call")
-async def trigger_web_call():
+async def trigger_web_call(request: Request):
     try:
-        from app.services.happyrobot_service import HappyRobotService
-        
-        happyrobot_service = HappyRobotService()
-        
+        happyrobot_service = request.app.state.happyrobot
+
         result = await happyrobot_service.trigger_web_call()
         
         logger.info("Web call triggered successfully", result=result)
@@ -240,5 +359,10 @@ if __name__ == "__main__":
         host=settings.app_host,
         port=settings.app_port,
         reload=settings.debug,
+        # uvicorn[standard] ships both: libuv event loop + C HTTP parser
+        loop="uvloop",
+        http="httptools",
+        # reload and multi-worker are mutually exclusive in uvicorn
+        workers=1 if settings.debug else (os.cpu_count() or 2),
         log_level=settings.log_level.lower()
     )
\ No newline at end of file
@@ -2,9 +2,12 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional, Dict, Any
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, Text, Enum as SQLEnum, Integer, DECIMAL as SQLDecimal, JSON
+import msgspec
+from sqlalchemy import CheckConstraint, Column, String, DateTime, Index, Text, Integer, DECIMAL as SQLDecimal, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
 from pydantic import BaseModel, ConfigDict
-from .load import Base
+from .load import Base, ResponseBase
 
 
 class CallOutcome(str, Enum):
@@ -16,6 +19,7 @@ class CallOutcome(str, Enum):
     TRANSFERRED_TO_SALES = "transferred_to_sales"
     CALL_DROPPED = "call_dropped"
     SYSTEM_ERROR = "system_error"
+    UNKNOWN = "unknown"
 
 
 class CallSentiment(str, Enum):
@@ -28,9 +32,33 @@ class CallSentiment(str, Enum):
 
 class Call(Base):
     __tablename__ = "calls"
-    
+    __table_args__ = (
+        # get_call_summary filters by start_time and groups by
+        # outcome/sentiment; recent-call listings order by start_time
+        Index("ix_calls_start_time", "start_time"),
+        # get_calls_by_carrier filters on the MC and orders by start_time;
+        # the composite covers both and its prefix replaces the old
+        # single-column carrier_mc_number index
+        Index("ix_calls_carrier_mc_start_time", "carrier_mc_number", "start_time"),
+        Index("ix_calls_outcome_start_time", "outcome", "start_time"),
+        Index("ix_calls_sentiment", "sentiment"),
+        Index("ix_calls_discussed_load_id", "discussed_load_id"),
+        # Containment/key filters on extracted_data stay sublinear on
+        # Postgres; SQLite skips the index entirely
+        Index("ix_calls_extracted_data_gin", "extracted_data", postgresql_using="gin")
+            .ddl_if(dialect="postgresql"),
+        CheckConstraint(
+            "outcome IN ({})".format(", ".join(f"'{e.value}'" for e in CallOutcome)),
+            name="ck_calls_outcome"
+        ),
+        CheckConstraint(
+            "sentiment IN ({})".format(", ".join(f"'{e.value}'" for e in CallSentiment)),
+            name="ck_calls_sentiment"
+        ),
+    )
+
     call_id = Column(String, primary_key=True, index=True)
-    carrier_mc_number = Column(String, nullable=False, index=True)
+    carrier_mc_number = Column(String, nullable=False)
     
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=True)
@@ -43,13 +71,18 @@ class Call(Base):
     initial_rate_offered = Column(SQLDecimal(10, 2), nullable=True)
     final_negotiated_rate = Column(SQLDecimal(10, 2), nullable=True)
     
-    outcome = Column(SQLEnum(CallOutcome), nullable=True)
-    sentiment = Column(SQLEnum(CallSentiment), nullable=True)
+    # Plain strings checked by the table constraints above: skips the
+    # per-row Enum result-processor on bulk fetches; the str-subclass enum
+    # members still bind as their values, and Pydantic coerces on output
+    outcome = Column(String(32), nullable=True)
+    sentiment = Column(String(16), nullable=True)
     
-    extracted_data = Column(JSON, nullable=True)
+    # JSONB on Postgres stores pre-parsed binary (and feeds the GIN index);
+    # plain JSON remains the SQLite representation
+    extracted_data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=datetime.utcnow)
 
 
 class CallCreate(BaseModel):
@@ -71,9 +104,7 @@ class CallUpdate(BaseModel):
     extracted_data: Optional[Dict[str, Any]] = None
 
 
-class CallResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-    
+class CallResponse(ResponseBase):
     call_id: str
     carrier_mc_number: str
     start_time: datetime
@@ -91,6 +122,36 @@ class CallResponse(BaseModel):
     updated_at: datetime
 
 
+class ExtractedCallData(BaseModel):
+    """Typed schema for agent-extracted call data; unknown keys pass through"""
+    model_config = ConfigDict(extra="allow")
+
+    carrier_mc_number: Optional[str] = None
+    carrier_company_name: Optional[str] = None
+    equipment_type: Optional[str] = None
+    call_outcome: Optional[str] = None
+    carrier_sentiment: Optional[str] = None
+    final_agreed_rate: Optional[str] = None
+    discussed_load_id: Optional[str] = None
+
+
+class CallListItem(msgspec.Struct):
+    """Column projection of Call for list endpoints
+
+    Omits transcript and extracted_data, which dominate row size and are
+    only needed on the detail endpoint.
+    """
+    call_id: str
+    carrier_mc_number: str
+    start_time: datetime
+    end_time: Optional[datetime]
+    duration_seconds: Optional[int]
+    discussed_load_id: Optional[str]
+    final_negotiated_rate: Optional[Decimal]
+    outcome: Optional[CallOutcome]
+    sentiment: Optional[CallSentiment]
+
+
 class CallSummary(BaseModel):
     total_calls: int
     successful_bookings: int
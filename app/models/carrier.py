@@ -3,9 +3,12 @@ Carrier model for trucking companies
 """
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, String, DateTime, Boolean, Integer, Text
+import msgspec
+from sqlalchemy import Column, Index, JSON, String, DateTime, Boolean, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
 from pydantic import BaseModel, ConfigDict
-from .load import Base
+from .load import Base, ResponseBase
 
 
 class Carrier(Base):
@@ -13,7 +16,13 @@ class Carrier(Base):
     Carrier database model representing a trucking company
     """
     __tablename__ = "carriers"
-    
+    __table_args__ = (
+        # "carriers that run reefer" containment filters use the GIN index
+        # on Postgres; SQLite skips it
+        Index("ix_carriers_equipment_types_gin", "equipment_types", postgresql_using="gin")
+            .ddl_if(dialect="postgresql"),
+    )
+
     mc_number = Column(String, primary_key=True, index=True)
     company_name = Column(String, nullable=False)
     dot_number = Column(String, nullable=True)
@@ -31,12 +40,13 @@ class Carrier(Base):
     successful_loads = Column(Integer, default=0)
     average_rating = Column(Integer, nullable=True)  # 1-5 scale
     
-    # Equipment capabilities
-    equipment_types = Column(Text, nullable=True)  # JSON array of equipment types
+    # Equipment capabilities: a real JSON list (JSONB on Postgres), so the
+    # service layer stops round-tripping through json.dumps/json.loads
+    equipment_types = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     last_contact_at = Column(DateTime, nullable=True)
 
 
@@ -64,10 +74,8 @@ class CarrierUpdate(BaseModel):
     average_rating: Optional[int] = None
 
 
-class CarrierResponse(BaseModel):
+class CarrierResponse(ResponseBase):
     """Pydantic model for carrier API responses"""
-    model_config = ConfigDict(from_attributes=True)
-    
     mc_number: str
     company_name: str
     dot_number: Optional[str] = None
@@ -86,6 +94,26 @@ class CarrierResponse(BaseModel):
     last_contact_at: Optional[datetime] = None
 
 
+class CarrierResponseFast(msgspec.Struct):
+    """msgspec twin of CarrierResponse for hot list serialization"""
+    mc_number: str
+    company_name: str
+    dot_number: Optional[str]
+    phone: Optional[str]
+    email: Optional[str]
+    address: Optional[str]
+    is_verified: bool
+    fmcsa_status: Optional[str]
+    last_verified_at: Optional[datetime]
+    total_loads: int
+    successful_loads: int
+    average_rating: Optional[int]
+    equipment_types: Optional[list]
+    created_at: datetime
+    updated_at: datetime
+    last_contact_at: Optional[datetime]
+
+
 class FMCSAVerification(BaseModel):
     """Pydantic model for FMCSA verification response"""
     mc_number: str
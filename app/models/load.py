@@ -4,7 +4,9 @@ Load model for freight shipments
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, DECIMAL as SQLDecimal, Text, Boolean
+import msgspec
+from sqlalchemy import Column, Index, Integer, String, DateTime, DECIMAL as SQLDecimal, Text, Boolean, text
+from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
 from pydantic import BaseModel, ConfigDict
 
@@ -12,12 +14,41 @@ from pydantic import BaseModel, ConfigDict
 Base = declarative_base()
 
 
+class ResponseBase(BaseModel):
+    """Shared base for API response models built from ORM rows"""
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_fast(cls, obj):
+        """
+        Build the response via model_construct, skipping validation.
+
+        Rows coming back from the database were already validated on the
+        write path, so re-running the full validator pipeline per row is
+        wasted work on read endpoints.
+        """
+        return cls.model_construct(**{field: getattr(obj, field) for field in cls.model_fields})
+
+
+def struct_from_orm(struct_cls, obj):
+    """Build a msgspec response Struct straight off an ORM row"""
+    return struct_cls(*[getattr(obj, field) for field in struct_cls.__struct_fields__])
+
+
 class Load(Base):
     """
     Load database model representing a freight shipment
     """
     __tablename__ = "loads"
-    
+    __table_args__ = (
+        # find_matching_loads filters on availability + equipment and orders
+        # by rate; the index serves the sort so LIMIT 10 stops early. On
+        # Postgres it is partial since only available loads are ever matched.
+        Index("ix_loads_match", "is_available", "equipment_type", "loadboard_rate",
+              postgresql_where=text("is_available = true")),
+        Index("ix_loads_pickup_datetime", "pickup_datetime"),
+    )
+
     # Required fields from specification
     load_id = Column(String, primary_key=True, index=True)
     origin = Column(String, nullable=False)
@@ -35,8 +66,8 @@ class Load(Base):
     
     # Additional tracking fields
     is_available = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     assigned_carrier_mc = Column(String, nullable=True)
     final_rate = Column(SQLDecimal(10, 2), nullable=True)
 
@@ -77,10 +108,8 @@ class LoadUpdate(BaseModel):
     final_rate: Optional[Decimal] = None
 
 
-class LoadResponse(BaseModel):
+class LoadResponse(ResponseBase):
     """Pydantic model for load API responses"""
-    model_config = ConfigDict(from_attributes=True)
-    
     load_id: str
     origin: str
     destination: str
@@ -101,6 +130,42 @@ class LoadResponse(BaseModel):
     final_rate: Optional[Decimal] = None
 
 
+class LoadResponseFast(msgspec.Struct):
+    """msgspec twin of LoadResponse for hot list serialization"""
+    load_id: str
+    origin: str
+    destination: str
+    pickup_datetime: datetime
+    delivery_datetime: datetime
+    equipment_type: str
+    loadboard_rate: Decimal
+    notes: Optional[str]
+    weight: Optional[int]
+    commodity_type: str
+    num_of_pieces: Optional[int]
+    miles: Optional[int]
+    dimensions: Optional[str]
+    is_available: bool
+    created_at: datetime
+    updated_at: datetime
+    assigned_carrier_mc: Optional[str]
+    final_rate: Optional[Decimal]
+
+
+class LoadPitch(msgspec.Struct):
+    """Agent-facing pitch summary of a load"""
+    load_id: str
+    route: str
+    pickup_date: str
+    delivery_date: str
+    distance: str
+    equipment: str
+    rate: str
+    commodity: str
+    weight: str
+    special_notes: str
+
+
 class LoadMatch(BaseModel):
     """Pydantic model for load matching criteria"""
     origin_radius: Optional[int] = 100  # miles
@@ -5,9 +5,10 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, DECIMAL as SQLDecimal, Integer, Enum as SQLEnum, Text
+from sqlalchemy import CheckConstraint, Column, String, DateTime, DECIMAL as SQLDecimal, Index, Integer, Text
+from sqlalchemy.sql import func
 from pydantic import BaseModel, ConfigDict
-from .load import Base
+from .load import Base, ResponseBase
 
 
 class NegotiationStatus(str, Enum):
@@ -30,24 +31,45 @@ class Negotiation(Base):
     Negotiation database model for tracking pricing negotiations
     """
     __tablename__ = "negotiations"
-    
+    __table_args__ = (
+        # get_active_negotiation_for_call filters on both columns
+        Index("ix_negotiations_call_id_status", "call_id", "status"),
+        # cleanup_expired_negotiations seeks active rows past their expiry
+        Index("ix_negotiations_status_expires_at", "status", "expires_at"),
+        CheckConstraint(
+            "status IN ({})".format(", ".join(f"'{e.value}'" for e in NegotiationStatus)),
+            name="ck_negotiations_status"
+        ),
+        CheckConstraint(
+            "current_offer_type IN ({})".format(", ".join(f"'{e.value}'" for e in OfferType)),
+            name="ck_negotiations_offer_type"
+        ),
+    )
+
     negotiation_id = Column(String, primary_key=True, index=True)
     call_id = Column(String, nullable=False, index=True)
     load_id = Column(String, nullable=False, index=True)
     carrier_mc_number = Column(String, nullable=False)
     
-    # Current negotiation state
-    status = Column(SQLEnum(NegotiationStatus), default=NegotiationStatus.ACTIVE)
+    # Current negotiation state. Plain strings checked by the table
+    # constraints above: skips the per-row Enum result-processor; the
+    # str-subclass enum members still bind and compare by value
+    status = Column(String(16), default=NegotiationStatus.ACTIVE.value)
     current_round = Column(Integer, default=1)
     max_rounds = Column(Integer, default=3)
     
     # Current offer details
     current_offer_amount = Column(SQLDecimal(10, 2), nullable=False)
     current_offer_by = Column(String, nullable=False)  # 'broker' or 'carrier'
-    current_offer_type = Column(SQLEnum(OfferType), nullable=False)
+    current_offer_type = Column(String(16), nullable=False)
     
     # Original loadboard rate
     original_rate = Column(SQLDecimal(10, 2), nullable=False)
+
+    # Acceptance thresholds precomputed at creation so offer evaluation
+    # skips the per-call Decimal math
+    min_acceptable_rate = Column(SQLDecimal(10, 2), nullable=True)
+    final_round_min_rate = Column(SQLDecimal(10, 2), nullable=True)
     
     # Final agreement
     final_agreed_rate = Column(SQLDecimal(10, 2), nullable=True)
@@ -57,8 +79,8 @@ class Negotiation(Base):
     carrier_feedback = Column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     expires_at = Column(DateTime, nullable=True)
 
 
@@ -88,10 +110,8 @@ class NegotiationUpdate(BaseModel):
     expires_at: Optional[datetime] = None
 
 
-class NegotiationResponse(BaseModel):
+class NegotiationResponse(ResponseBase):
     """Pydantic model for negotiation API responses"""
-    model_config = ConfigDict(from_attributes=True)
-    
     negotiation_id: str
     call_id: str
     load_id: str
@@ -1,114 +1,219 @@
+import re
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func, insert, tuple_, update
+from sqlalchemy.exc import IntegrityError
 import structlog
-from app.models.call import Call, CallCreate, CallUpdate, CallOutcome, CallSentiment, CallSummary
+from app.database.inserts import insert_ignoring_conflicts
+from app.models.call import Call, CallCreate, CallOutcome, CallSentiment, CallSummary
 
 logger = structlog.get_logger()
 
+# Classification keyword sets, compiled once into a single alternation so a
+# transcript is scanned in one pass instead of once per keyword
+_POSITIVE_WORDS = frozenset(["great", "excellent", "perfect", "thank you", "appreciate", "good"])
+_NEGATIVE_WORDS = frozenset(["frustrated", "angry", "terrible", "awful", "ridiculous", "waste"])
+_FRUSTRATED_WORDS = frozenset(["why", "always", "never", "impossible", "difficult"])
+_REJECTED_PHRASES = frozenset(["not interested", "declined", "pass"])
+_TRANSFER_PHRASES = frozenset(["transfer", "sales rep"])
+_DROPPED_PHRASES = frozenset(["dropped", "hung up", "disconnected"])
+
+_ALL_KEYWORDS = (_POSITIVE_WORDS | _NEGATIVE_WORDS | _FRUSTRATED_WORDS
+                 | _REJECTED_PHRASES | _TRANSFER_PHRASES | _DROPPED_PHRASES)
+# Longest alternatives first so multi-word phrases win over their substrings
+_KEYWORD_RE = re.compile("|".join(
+    re.escape(keyword) for keyword in sorted(_ALL_KEYWORDS, key=len, reverse=True)
+))
+
+
+def _matched_keywords(transcript_lower: str) -> set:
+    """Single linear scan returning the set of classification keywords present"""
+    return set(_KEYWORD_RE.findall(transcript_lower))
+
+
+# List endpoints project these columns only, leaving the bulky transcript
+# and extracted_data out of the rows entirely (matches CallListItem)
+_CALL_LIST_COLUMNS = (
+    Call.call_id,
+    Call.carrier_mc_number,
+    Call.start_time,
+    Call.end_time,
+    Call.duration_seconds,
+    Call.discussed_load_id,
+    Call.final_negotiated_rate,
+    Call.outcome,
+    Call.sentiment,
+)
+
 
 class CallService:
     
     def __init__(self, db: Session):
         self.db = db
     
-    def create_call(self, call_data: CallCreate) -> Call:
-        db_call = Call(**call_data.model_dump())
-        self.db.add(db_call)
+    def create_call(self, call_data: CallCreate) -> Optional[Call]:
+        # INSERT ... RETURNING brings back the row with its server defaults,
+        # so no post-commit refresh SELECT is needed
+        stmt = insert(Call).values(**call_data.model_dump()).returning(Call)
+        try:
+            db_call = self.db.execute(stmt).scalars().first()
+        except IntegrityError:
+            # Duplicate call_id: single atomic INSERT instead of a racy
+            # get-then-insert pre-check
+            self.db.rollback()
+            return None
         self.db.commit()
-        self.db.refresh(db_call)
         return db_call
     
+    def create_calls(self, call_datas: List[CallCreate]) -> List[str]:
+        """
+        Create a batch of calls with one multi-row INSERT
+
+        call_ids that already exist (or repeat within the batch) are
+        skipped so seed/import runs replay safely.
+
+        Returns:
+            List[str]: call_ids actually inserted
+        """
+        if not call_datas:
+            return []
+
+        existing_ids = {
+            row[0] for row in self.db.query(Call.call_id)
+            .filter(Call.call_id.in_([c.call_id for c in call_datas]))
+        }
+        rows = []
+        seen_ids = set(existing_ids)
+        for call_data in call_datas:
+            if call_data.call_id not in seen_ids:
+                seen_ids.add(call_data.call_id)
+                rows.append(call_data.model_dump())
+
+        if rows:
+            # ON CONFLICT DO NOTHING covers ids inserted between the
+            # existence check and this statement
+            insert_ignoring_conflicts(self.db, Call, rows, index_elements=["call_id"])
+            self.db.commit()
+        return [row["call_id"] for row in rows]
+
     def get_call(self, call_id: str) -> Optional[Call]:
         return self.db.query(Call).filter(Call.call_id == call_id).first()
     
-    def get_calls_by_carrier(self, mc_number: str, skip: int = 0, limit: int = 100) -> List[Call]:
-        return (self.db.query(Call)
+    def get_calls_by_carrier(self, mc_number: str, skip: int = 0, limit: int = 100,
+                             cursor: Optional[tuple] = None) -> tuple:
+        # The total always counts the carrier's whole call collection, on
+        # offset and cursor pages alike, so it never shrinks mid-scroll
+        if cursor is not None:
+            # Keyset seek: each page is one index range scan on
+            # (carrier_mc_number, start_time) no matter how deep, and new
+            # calls arriving mid-scroll can't duplicate or skip rows. The
+            # window count would only cover rows past the cursor, so the
+            # full count comes from its own query here.
+            rows = (self.db.query(*_CALL_LIST_COLUMNS)
+                    .filter(Call.carrier_mc_number == mc_number,
+                            tuple_(Call.start_time, Call.call_id) < cursor)
+                    .order_by(Call.start_time.desc(), Call.call_id.desc())
+                    .limit(limit)
+                    .all())
+            total = (self.db.query(func.count(Call.call_id))
+                     .filter(Call.carrier_mc_number == mc_number)
+                     .scalar())
+            return rows, total or 0
+
+        rows = (self.db.query(*_CALL_LIST_COLUMNS, func.count().over().label("total"))
                 .filter(Call.carrier_mc_number == mc_number)
-                .order_by(Call.start_time.desc())
+                .order_by(Call.start_time.desc(), Call.call_id.desc())
                 .offset(skip)
                 .limit(limit)
                 .all())
-    
-    def get_recent_calls(self, limit: int = 50) -> List[Call]:
-        return (self.db.query(Call)
+        if rows:
+            return rows, rows[0][-1]
+        if skip:
+            # The page ran past the end, taking the window count with it;
+            # report the carrier's real call count rather than zero
+            total = (self.db.query(func.count(Call.call_id))
+                     .filter(Call.carrier_mc_number == mc_number)
+                     .scalar())
+            return [], total or 0
+        return [], 0
+
+    def get_recent_calls(self, limit: int = 50) -> List:
+        return (self.db.query(*_CALL_LIST_COLUMNS)
                 .order_by(Call.start_time.desc())
                 .limit(limit)
                 .all())
     
-    def update_call(self, call_id: str, call_update: CallUpdate) -> Optional[Call]:
-        db_call = self.get_call(call_id)
-        if not db_call:
-            return None
-        
-        update_data = call_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_call, field, value)
-        
-        db_call.updated_at = datetime.utcnow()
+    def update_call(self, call_id: str, patch: Dict[str, Any]) -> Optional[Call]:
+        # Takes a plain field dict; validation belongs to the public PUT
+        # endpoint, and internal callers already hold trusted values.
+        # One UPDATE ... RETURNING replaces the old select-mutate-refresh
+        # triple round-trip; a missing row simply returns no result.
+        stmt = (update(Call)
+                .where(Call.call_id == call_id)
+                .values(updated_at=datetime.utcnow(), **patch)
+                .returning(Call))
+        db_call = self.db.execute(
+            stmt, execution_options={"synchronize_session": False, "populate_existing": True}
+        ).scalars().first()
         self.db.commit()
-        self.db.refresh(db_call)
         return db_call
     
     def end_call(self, call_id: str, outcome: CallOutcome, sentiment: CallSentiment) -> Optional[Call]:
-        db_call = self.get_call(call_id)
+        # One locked select + in-place update; the old path re-fetched the
+        # row inside update_call. Duration needs start_time, so a pure
+        # UPDATE ... RETURNING can't compute it portably across dialects.
+        db_call = (self.db.query(Call)
+                   .filter(Call.call_id == call_id)
+                   .with_for_update()
+                   .first())
         if not db_call:
             return None
-        
+
         end_time = datetime.utcnow()
-        duration = int((end_time - db_call.start_time).total_seconds()) if db_call.start_time else None
-        
-        update_data = CallUpdate(
-            end_time=end_time,
-            duration_seconds=duration,
-            outcome=outcome,
-            sentiment=sentiment
-        )
-        
-        return self.update_call(call_id, update_data)
+        db_call.end_time = end_time
+        db_call.duration_seconds = int((end_time - db_call.start_time).total_seconds()) if db_call.start_time else None
+        db_call.outcome = outcome
+        db_call.sentiment = sentiment
+        db_call.updated_at = end_time
+        self.db.commit()
+        return db_call
     
     def extract_call_data(self, call_id: str, extracted_data: Dict[str, Any]) -> Optional[Call]:
-        update_data = CallUpdate(extracted_data=extracted_data)
-        return self.update_call(call_id, update_data)
+        return self.update_call(call_id, {"extracted_data": extracted_data})
     
     def get_call_summary(self, days: int = 30) -> CallSummary:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        base_query = self.db.query(Call).filter(Call.start_time >= cutoff_date)
-        
-        total_calls = base_query.count()
-        
-        successful_bookings = (base_query
-                             .filter(Call.outcome == CallOutcome.SUCCESSFUL_BOOKING)
-                             .count())
-        
-        avg_duration_result = (base_query
-                              .filter(Call.duration_seconds.isnot(None))
-                              .with_entities(func.avg(Call.duration_seconds))
-                              .scalar())
-        avg_duration = float(avg_duration_result) if avg_duration_result else None
-        
-        sentiment_data = (base_query
-                         .filter(Call.sentiment.isnot(None))
-                         .with_entities(Call.sentiment, func.count(Call.sentiment))
-                         .group_by(Call.sentiment)
-                         .all())
-        
-        sentiment_breakdown = {
-            sentiment: count for sentiment, count in sentiment_data
-        }
-        
-        outcome_data = (base_query
-                       .filter(Call.outcome.isnot(None))
-                       .with_entities(Call.outcome, func.count(Call.outcome))
-                       .group_by(Call.outcome)
-                       .all())
-        
-        outcome_breakdown = {
-            outcome: count for outcome, count in outcome_data
-        }
-        
+
+        # The old implementation scanned the date window five times (count,
+        # successful count, avg, two group-bys). One scalar-aggregate query
+        # plus one grouped scan now produce the same summary.
+        total_calls, successful_bookings, avg_duration_result = (
+            self.db.query(
+                func.count(Call.call_id),
+                func.sum(case((Call.outcome == CallOutcome.SUCCESSFUL_BOOKING, 1), else_=0)),
+                func.avg(Call.duration_seconds)
+            )
+            .filter(Call.start_time >= cutoff_date)
+            .one()
+        )
+        total_calls = total_calls or 0
+        successful_bookings = int(successful_bookings or 0)
+        avg_duration = float(avg_duration_result) if avg_duration_result is not None else None
+
+        # Both breakdowns fall out of a single (sentiment, outcome) group-by
+        sentiment_breakdown = {}
+        outcome_breakdown = {}
+        breakdown_rows = (self.db.query(Call.sentiment, Call.outcome, func.count())
+                          .filter(Call.start_time >= cutoff_date)
+                          .group_by(Call.sentiment, Call.outcome)
+                          .all())
+        for sentiment, outcome, count in breakdown_rows:
+            if sentiment is not None:
+                sentiment_breakdown[sentiment] = sentiment_breakdown.get(sentiment, 0) + count
+            if outcome is not None:
+                outcome_breakdown[outcome] = outcome_breakdown.get(outcome, 0) + count
+
         conversion_rate = (successful_bookings / total_calls * 100) if total_calls > 0 else 0.0
         
         return CallSummary(
@@ -133,31 +238,32 @@ class CallService:
             return CallOutcome.SUCCESSFUL_BOOKING
         
         if transcript:
-            transcript_lower = transcript.lower()
-            if any(phrase in transcript_lower for phrase in ["not interested", "declined", "pass"]):
-                return CallOutcome.REJECTED_BY_CARRIER
-            if "transfer" in transcript_lower or "sales rep" in transcript_lower:
-                return CallOutcome.TRANSFERRED_TO_SALES
-            if any(phrase in transcript_lower for phrase in ["dropped", "hung up", "disconnected"]):
-                return CallOutcome.CALL_DROPPED
-        
+            return self._outcome_from_matches(_matched_keywords(transcript.lower()))
+
+        return CallOutcome.NEGOTIATION_FAILED
+
+    @staticmethod
+    def _outcome_from_matches(matched: set) -> CallOutcome:
+        if matched & _REJECTED_PHRASES:
+            return CallOutcome.REJECTED_BY_CARRIER
+        if matched & _TRANSFER_PHRASES:
+            return CallOutcome.TRANSFERRED_TO_SALES
+        if matched & _DROPPED_PHRASES:
+            return CallOutcome.CALL_DROPPED
         return CallOutcome.NEGOTIATION_FAILED
     
     def classify_call_sentiment(self, transcript: str) -> CallSentiment:
         if not transcript:
             return CallSentiment.NEUTRAL
         
-        transcript_lower = transcript.lower()
-        
-        positive_words = ["great", "excellent", "perfect", "thank you", "appreciate", "good"]
-        positive_count = sum(1 for word in positive_words if word in transcript_lower)
-        
-        negative_words = ["frustrated", "angry", "terrible", "awful", "ridiculous", "waste"]
-        negative_count = sum(1 for word in negative_words if word in transcript_lower)
-        
-        frustrated_words = ["why", "always", "never", "impossible", "difficult"]
-        frustrated_count = sum(1 for word in frustrated_words if word in transcript_lower)
-        
+        return self._sentiment_from_matches(_matched_keywords(transcript.lower()))
+
+    @staticmethod
+    def _sentiment_from_matches(matched: set) -> CallSentiment:
+        positive_count = len(matched & _POSITIVE_WORDS)
+        negative_count = len(matched & _NEGATIVE_WORDS)
+        frustrated_count = len(matched & _FRUSTRATED_WORDS)
+
         if negative_count > positive_count:
             return CallSentiment.NEGATIVE
         elif frustrated_count > 2:
@@ -167,100 +273,192 @@ class CallService:
         else:
             return CallSentiment.NEUTRAL
     
-    async def process_happyrobot_webhook(self, webhook_payload: Dict[str, Any]) -> Optional[Call]:
-        try:
-            call_data = webhook_payload.get("call_data", {})
-            
-            extracted_data = {}
-            if "extracted_data" in call_data:
-                raw_extracted = call_data.get("extracted_data")
-                if isinstance(raw_extracted, str):
-                    try:
-                        import json
-                        extracted_data = json.loads(raw_extracted)
-                    except:
-                        logger.warning("Could not parse extracted_data as JSON", raw_data=raw_extracted)
-                        extracted_data = {}
-                else:
-                    extracted_data = raw_extracted or {}
+    def classify_and_update(self, call_id: str, transcript: Optional[str] = None,
+                            negotiation_successful: bool = False, carrier_verified: bool = False,
+                            loads_available: bool = False) -> Optional[Call]:
+        # Single locked read-modify-write: the old endpoint did a get_call
+        # followed by update_call's own SELECT, tripling roundtrips and
+        # letting two concurrent classifications interleave
+        db_call = (self.db.query(Call)
+                   .filter(Call.call_id == call_id)
+                   .with_for_update()
+                   .first())
+        if not db_call:
+            return None
+
+        if not transcript and db_call.transcript:
+            transcript = db_call.transcript
+
+        # One lowercase pass and one keyword scan feed both classifiers
+        matched = _matched_keywords(transcript.lower()) if transcript else set()
+
+        if not carrier_verified:
+            db_call.outcome = CallOutcome.FAILED_VERIFICATION
+        elif not loads_available:
+            db_call.outcome = CallOutcome.NO_SUITABLE_LOADS
+        elif negotiation_successful:
+            db_call.outcome = CallOutcome.SUCCESSFUL_BOOKING
+        else:
+            db_call.outcome = self._outcome_from_matches(matched)
+        db_call.sentiment = self._sentiment_from_matches(matched) if matched else CallSentiment.NEUTRAL
+
+        if transcript and not db_call.transcript:
+            db_call.transcript = transcript
+
+        db_call.updated_at = datetime.utcnow()
+        self.db.commit()
+        return db_call
+
+    def _extract_call_row(self, webhook_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Translate a HappyRobot webhook payload into Call column values"""
+        call_data = webhook_payload.get("call_data", {})
+
+        extracted_data = {}
+        if "extracted_data" in call_data:
+            raw_extracted = call_data.get("extracted_data")
+            if isinstance(raw_extracted, str):
+                try:
+                    import json
+                    extracted_data = json.loads(raw_extracted)
+                except ValueError:
+                    logger.warning("Could not parse extracted_data as JSON", raw_data=raw_extracted)
+                    extracted_data = {}
             else:
-                extracted_data = webhook_payload.get("extracted_data", {})
-            
-            happyrobot_call_id = call_data.get("happyrobot_call_id", "")
-            call_id = f"hr_{happyrobot_call_id}" if happyrobot_call_id else f"call_{int(datetime.utcnow().timestamp())}"
-            
-            carrier_mc = extracted_data.get("carrier_mc_number")
-            company_name = extracted_data.get("carrier_company_name")
-            outcome_str = extracted_data.get("call_outcome", "unknown")
-            sentiment_str = extracted_data.get("carrier_sentiment", "neutral")
-            
+                extracted_data = raw_extracted or {}
+        else:
+            extracted_data = webhook_payload.get("extracted_data", {})
+
+        happyrobot_call_id = call_data.get("happyrobot_call_id", "")
+        call_id = f"hr_{happyrobot_call_id}" if happyrobot_call_id else f"call_{int(datetime.utcnow().timestamp())}"
+
+        outcome_str = extracted_data.get("call_outcome", "unknown")
+        sentiment_str = extracted_data.get("carrier_sentiment", "neutral")
+
+        try:
+            outcome = CallOutcome(outcome_str.lower()) if outcome_str else CallOutcome.UNKNOWN
+        except ValueError:
+            outcome = CallOutcome.UNKNOWN
+
+        try:
+            sentiment = CallSentiment(sentiment_str.lower()) if sentiment_str else CallSentiment.NEUTRAL
+        except ValueError:
+            sentiment = CallSentiment.NEUTRAL
+
+        # Python 3.11's C fromisoformat accepts the trailing Z directly,
+        # so no per-webhook string copy is needed before parsing
+        start_time = datetime.utcnow()  # Default to now if not provided
+        if call_data.get("start_time"):
+            try:
+                start_time = datetime.fromisoformat(call_data["start_time"])
+            except (TypeError, ValueError):
+                pass
+
+        end_time = datetime.utcnow()
+        if call_data.get("end_time"):
             try:
-                outcome = CallOutcome(outcome_str.lower()) if outcome_str else CallOutcome.UNKNOWN
-            except ValueError:
-                outcome = CallOutcome.UNKNOWN
-                
+                end_time = datetime.fromisoformat(call_data["end_time"])
+            except (TypeError, ValueError):
+                pass
+
+        duration_seconds = int((end_time - start_time).total_seconds())
+
+        final_rate = None
+        if extracted_data.get("final_agreed_rate"):
             try:
-                sentiment = CallSentiment(sentiment_str.lower()) if sentiment_str else CallSentiment.NEUTRAL
-            except ValueError:
-                sentiment = CallSentiment.NEUTRAL
-            
-            start_time = datetime.utcnow()  # Default to now if not provided
-            if call_data.get("start_time"):
-                try:
-                    start_time = datetime.fromisoformat(call_data["start_time"].replace("Z", "+00:00"))
-                except:
-                    pass
-            
-            end_time = datetime.utcnow()
-            if call_data.get("end_time"):
-                try:
-                    end_time = datetime.fromisoformat(call_data["end_time"].replace("Z", "+00:00"))
-                except:
-                    pass
-            
-            duration_seconds = int((end_time - start_time).total_seconds())
-            
-            final_rate = None
-            if extracted_data.get("final_agreed_rate"):
-                try:
-                    final_rate = float(extracted_data["final_agreed_rate"])
-                except (ValueError, TypeError):
-                    pass
-            
-            call_create = CallCreate(
-                call_id=call_id,
-                carrier_mc_number=carrier_mc,
-                start_time=start_time,
-                happyrobot_call_id=happyrobot_call_id
-            )
-            
-            call_record = self.create_call(call_create)
-            
-            from app.models.call import CallUpdate
-            call_update = CallUpdate(
-                end_time=end_time,
-                duration_seconds=duration_seconds,
-                outcome=outcome,
-                sentiment=sentiment,
-                discussed_load_id=extracted_data.get("discussed_load_id"),
-                final_negotiated_rate=final_rate,
-                transcript=call_data.get("transcript", ""),
-                extracted_data=extracted_data
-            )
-            
-            call_record = self.update_call(call_id, call_update)
-            
-            logger.info("Successfully processed HappyRobot webhook", 
-                       call_id=call_id, 
-                       carrier_mc=carrier_mc,
-                       outcome=outcome.value if outcome else "unknown")
-            
+                final_rate = float(extracted_data["final_agreed_rate"])
+            except (ValueError, TypeError):
+                pass
+
+        return {
+            "call_id": call_id,
+            "carrier_mc_number": extracted_data.get("carrier_mc_number"),
+            "start_time": start_time,
+            "happyrobot_call_id": happyrobot_call_id,
+            "end_time": end_time,
+            "duration_seconds": duration_seconds,
+            "outcome": outcome,
+            "sentiment": sentiment,
+            "discussed_load_id": extracted_data.get("discussed_load_id"),
+            "final_negotiated_rate": final_rate,
+            "transcript": call_data.get("transcript", ""),
+            "extracted_data": extracted_data
+        }
+
+    # Columns of the extracted row that identify the call rather than
+    # describe its result; replays patch everything but these
+    _CALL_ROW_KEY_FIELDS = ("call_id", "carrier_mc_number", "start_time", "happyrobot_call_id")
+
+    def process_happyrobot_webhook(self, webhook_payload: Dict[str, Any]) -> Optional[Call]:
+        # Sync on purpose: all the work here is blocking SQLAlchemy calls,
+        # so async callers dispatch it to the threadpool instead of letting
+        # it stall the event loop
+        try:
+            row = self._extract_call_row(webhook_payload)
+
+            # One INSERT with the full row instead of create_call followed by
+            # update_call (insert + select + update, each with its own commit)
+            call_record = Call(**row)
+            self.db.add(call_record)
+            try:
+                self.db.commit()
+                self.db.refresh(call_record)
+            except IntegrityError:
+                # Replayed webhook for an existing call: patch the row instead
+                self.db.rollback()
+                patch = {field: value for field, value in row.items()
+                         if field not in self._CALL_ROW_KEY_FIELDS}
+                call_record = self.update_call(row["call_id"], patch)
+
+            logger.info("Successfully processed HappyRobot webhook",
+                       call_id=row["call_id"],
+                       carrier_mc=row["carrier_mc_number"],
+                       outcome=row["outcome"].value if row["outcome"] else "unknown")
+
             return call_record
-            
+
         except Exception as e:
-            logger.error("Error processing HappyRobot webhook", 
-                        error=str(e), 
+            logger.error("Error processing HappyRobot webhook",
+                        error=str(e),
                         error_type=type(e).__name__,
-                        payload=webhook_payload,
-                        extracted_data=extracted_data if 'extracted_data' in locals() else "not_extracted")
-            return None
\ No newline at end of file
+                        payload=webhook_payload)
+            return None
+
+    def process_happyrobot_webhooks_batch(self, webhook_payloads: List[Dict[str, Any]]) -> int:
+        """
+        Ingest a backlog of webhook payloads with one INSERT and one commit.
+
+        Used for replay bursts: per-payload commits become a single
+        bulk_insert_mappings (which skips unit-of-work bookkeeping), and
+        call_ids already present are dropped for idempotency.
+
+        Returns:
+            int: Number of calls inserted
+        """
+        rows = []
+        seen_ids = set()
+        for payload in webhook_payloads:
+            try:
+                row = self._extract_call_row(payload)
+            except Exception as e:
+                logger.error("Skipping malformed webhook payload", error=str(e))
+                continue
+            if row["call_id"] not in seen_ids:
+                seen_ids.add(row["call_id"])
+                rows.append(row)
+
+        if not rows:
+            return 0
+
+        existing_ids = {
+            r[0] for r in self.db.query(Call.call_id)
+            .filter(Call.call_id.in_([row["call_id"] for row in rows]))
+        }
+        to_insert = [row for row in rows if row["call_id"] not in existing_ids]
+        if to_insert:
+            # ON CONFLICT DO NOTHING covers ids inserted between the
+            # existence check and this statement
+            insert_ignoring_conflicts(self.db, Call, to_insert, index_elements=["call_id"])
+            self.db.commit()
+
+        logger.info("Processed webhook batch", received=len(webhook_payloads), inserted=len(to_insert))
+        return len(to_insert)
\ No newline at end of file
@@ -1,13 +1,30 @@
 """
 Service layer for carrier management and FMCSA verification
 """
-import json
+import time
 from typing import List, Optional
 from datetime import datetime
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-import httpx
+from sqlalchemy.exc import IntegrityError
+from app.database.pagination import paginate
 from app.models.carrier import Carrier, CarrierCreate, CarrierUpdate, FMCSAVerification
-from app.core.config import settings
+
+
+# Mock FMCSA verification data for demo purposes
+# In production, integrate with actual FMCSA API
+_FMCSA_MOCK_CARRIERS = {
+    "123456": {"company": "ABC Trucking LLC", "dot": "987654", "status": "ACTIVE"},
+    "789012": {"company": "XYZ Transport Inc", "dot": "555666", "status": "ACTIVE"},
+    "456789": {"company": "Best Freight Co", "dot": "111222", "status": "ACTIVE"},
+    "999888": {"company": "Demo Carrier Ltd", "dot": "333444", "status": "ACTIVE"}
+}
+
+# FMCSA status changes rarely; an hour-long TTL cache spares repeat lookups
+# (and, once the real HTTP API is wired in, repeat network round-trips)
+_FMCSA_CACHE = {}
+_FMCSA_CACHE_TTL_SECONDS = 3600.0
+_FMCSA_CACHE_MAX_ENTRIES = 10_000
 
 
 class CarrierService:
@@ -24,17 +41,19 @@ class CarrierService:
             carrier_data: Carrier creation data
             
         Returns:
-            Carrier: Created carrier record
-        """
-        # Convert equipment_types list to JSON string for storage
-        carrier_dict = carrier_data.model_dump()
-        if carrier_dict.get('equipment_types'):
-            carrier_dict['equipment_types'] = json.dumps(carrier_dict['equipment_types'])
-        
-        db_carrier = Carrier(**carrier_dict)
-        self.db.add(db_carrier)
+            Carrier: Created carrier record, or None if the MC number is taken
+        """
+        # INSERT ... RETURNING brings back the row with its server defaults,
+        # so no post-commit refresh SELECT is needed
+        stmt = insert(Carrier).values(**carrier_data.model_dump()).returning(Carrier)
+        try:
+            db_carrier = self.db.execute(stmt).scalars().first()
+        except IntegrityError:
+            # Duplicate MC number: single atomic INSERT instead of a racy
+            # get-then-insert pre-check
+            self.db.rollback()
+            return None
         self.db.commit()
-        self.db.refresh(db_carrier)
         return db_carrier
     
     def get_carrier(self, mc_number: str) -> Optional[Carrier]:
@@ -47,20 +66,22 @@ class CarrierService:
         Returns:
             Carrier: Carrier record or None if not found
         """
-        return self.db.query(Carrier).filter(Carrier.mc_number == mc_number).first()
+        # Session.get checks the identity map before touching the DB, so
+        # repeat lookups of the same carrier within a request are free
+        return self.db.get(Carrier, mc_number)
     
-    def get_carriers(self, skip: int = 0, limit: int = 100) -> List[Carrier]:
+    def get_carriers(self, skip: int = 0, limit: int = 100) -> tuple:
         """
         Get multiple carriers with pagination
-        
+
         Args:
             skip: Number of records to skip
             limit: Maximum number of records to return
-            
+
         Returns:
-            List[Carrier]: List of carrier records
+            tuple: (carriers, total) with the page and the overall row count
         """
-        return self.db.query(Carrier).offset(skip).limit(limit).all()
+        return paginate(self.db.query(Carrier), skip, limit)
     
     def update_carrier(self, mc_number: str, carrier_update: CarrierUpdate) -> Optional[Carrier]:
         """
@@ -73,22 +94,15 @@ class CarrierService:
         Returns:
             Carrier: Updated carrier record or None if not found
         """
-        db_carrier = self.get_carrier(mc_number)
-        if not db_carrier:
-            return None
-        
-        update_data = carrier_update.model_dump(exclude_unset=True)
-        
-        # Handle equipment_types conversion
-        if 'equipment_types' in update_data and update_data['equipment_types']:
-            update_data['equipment_types'] = json.dumps(update_data['equipment_types'])
-        
-        for field, value in update_data.items():
-            setattr(db_carrier, field, value)
-        
-        db_carrier.updated_at = datetime.utcnow()
+        # One UPDATE ... RETURNING instead of select-mutate-commit-refresh
+        stmt = (update(Carrier)
+                .where(Carrier.mc_number == mc_number)
+                .values(updated_at=datetime.utcnow(), **carrier_update.model_dump(exclude_unset=True))
+                .returning(Carrier))
+        db_carrier = self.db.execute(
+            stmt, execution_options={"synchronize_session": False, "populate_existing": True}
+        ).scalars().first()
         self.db.commit()
-        self.db.refresh(db_carrier)
         return db_carrier
     
     async def verify_carrier_with_fmcsa(self, mc_number: str) -> FMCSAVerification:
@@ -101,18 +115,13 @@ class CarrierService:
         Returns:
             FMCSAVerification: Verification result
         """
-        # Mock FMCSA verification for demo purposes
-        # In production, integrate with actual FMCSA API
-        mock_carriers = {
-            "123456": {"company": "ABC Trucking LLC", "dot": "987654", "status": "ACTIVE"},
-            "789012": {"company": "XYZ Transport Inc", "dot": "555666", "status": "ACTIVE"},
-            "456789": {"company": "Best Freight Co", "dot": "111222", "status": "ACTIVE"},
-            "999888": {"company": "Demo Carrier Ltd", "dot": "333444", "status": "ACTIVE"}
-        }
-        
-        if mc_number in mock_carriers:
-            carrier_info = mock_carriers[mc_number]
-            return FMCSAVerification(
+        cached = _FMCSA_CACHE.get(mc_number)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        carrier_info = _FMCSA_MOCK_CARRIERS.get(mc_number)
+        if carrier_info:
+            verification = FMCSAVerification(
                 mc_number=mc_number,
                 is_valid=True,
                 status="ACTIVE",
@@ -120,13 +129,18 @@ class CarrierService:
                 dot_number=carrier_info["dot"]
             )
         else:
-            return FMCSAVerification(
+            verification = FMCSAVerification(
                 mc_number=mc_number,
                 is_valid=True,  # Allow unknown carriers for demo
                 status="ACTIVE",
                 company_name=f"Carrier {mc_number}",
                 dot_number=f"DOT{mc_number}"
             )
+
+        if len(_FMCSA_CACHE) >= _FMCSA_CACHE_MAX_ENTRIES:
+            _FMCSA_CACHE.clear()
+        _FMCSA_CACHE[mc_number] = (time.monotonic() + _FMCSA_CACHE_TTL_SECONDS, verification)
+        return verification
     
     async def verify_and_update_carrier(self, mc_number: str) -> Optional[Carrier]:
         """
@@ -138,55 +152,64 @@ class CarrierService:
         Returns:
             Carrier: Updated carrier record or None if not found
         """
-        # Get or create carrier record
-        carrier = self.get_carrier(mc_number)
-        
-        # Verify with FMCSA
         verification = await self.verify_carrier_with_fmcsa(mc_number)
-        
-        if not carrier and verification.is_valid:
-            # Create new carrier if verification successful and not in database
-            carrier_data = CarrierCreate(
-                mc_number=mc_number,
-                company_name=verification.company_name or "Unknown Company",
-                dot_number=verification.dot_number
-            )
-            carrier = self.create_carrier(carrier_data)
-        
-        if carrier:
-            # Update existing carrier with verification results
-            update_data = CarrierUpdate(
-                is_verified=verification.is_valid,
-                fmcsa_status=verification.status
-            )
-            
+        now = datetime.utcnow()
+
+        # Get-or-create plus the verification fields all land in one commit;
+        # the old path committed up to three times and raced concurrent
+        # verifications of the same MC between its check and its insert
+        for _ in range(2):
+            carrier = self.get_carrier(mc_number)
+            if not carrier:
+                if not verification.is_valid:
+                    return None
+                carrier = Carrier(
+                    mc_number=mc_number,
+                    company_name=verification.company_name or "Unknown Company",
+                    dot_number=verification.dot_number
+                )
+                self.db.add(carrier)
+
+            carrier.is_verified = verification.is_valid
+            carrier.fmcsa_status = verification.status
             if verification.company_name and not carrier.company_name:
-                update_data.company_name = verification.company_name
-            
+                carrier.company_name = verification.company_name
             if verification.dot_number and not carrier.dot_number:
-                update_data.dot_number = verification.dot_number
-            
-            carrier = self.update_carrier(mc_number, update_data)
-            carrier.last_verified_at = datetime.utcnow()
-            self.db.commit()
-        
-        return carrier
+                carrier.dot_number = verification.dot_number
+            carrier.last_verified_at = now
+            carrier.updated_at = now
+
+            try:
+                self.db.commit()
+            except IntegrityError:
+                # Lost the insert race to a concurrent verification; retry
+                # once as a plain update of the winner's row
+                self.db.rollback()
+                continue
+            self.db.refresh(carrier)
+            return carrier
+
+        return self.get_carrier(mc_number)
     
-    def record_call_contact(self, mc_number: str) -> Optional[Carrier]:
+    def record_call_contact(self, mc_number: str) -> Optional[datetime]:
         """
         Record that a carrier was contacted
-        
+
         Args:
             mc_number: Carrier MC number
-            
+
         Returns:
-            Carrier: Updated carrier record or None if not found
-        """
-        carrier = self.get_carrier(mc_number)
-        if carrier:
-            carrier.last_contact_at = datetime.utcnow()
-            self.db.commit()
-        return carrier
+            datetime: New last_contact_at timestamp or None if not found
+        """
+        # Single UPDATE ... RETURNING instead of select-then-mutate; the
+        # caller only needs the new timestamp, not a hydrated ORM object
+        stmt = (update(Carrier)
+                .where(Carrier.mc_number == mc_number)
+                .values(last_contact_at=datetime.utcnow())
+                .returning(Carrier.last_contact_at))
+        row = self.db.execute(stmt).first()
+        self.db.commit()
+        return row[0] if row else None
     
     def get_carrier_equipment_types(self, mc_number: str) -> List[str]:
         """
@@ -200,8 +223,5 @@ class CarrierService:
         """
         carrier = self.get_carrier(mc_number)
         if carrier and carrier.equipment_types:
-            try:
-                return json.loads(carrier.equipment_types)
-            except json.JSONDecodeError:
-                return []
+            return carrier.equipment_types
         return []
\ No newline at end of file
@@ -1,59 +1,14 @@
-import json
+import asyncio
+import random
+import time
 from typing import Dict, Any, Optional
 import httpx
+import orjson
 from app.core.config import settings
 from app.core.security import create_api_key_header
 
 
-class HappyRobotService:
-    
-    def __init__(self):
-        self.base_url = "https://platform.happyrobot.ai/api/v1" 
-        self.api_key = settings.happyrobot_api_key
-        self.agent_id = settings.happyrobot_agent_id
-        self.org_id = settings.happyrobot_org_id
-        self.workflow_id = settings.happyrobot_workflow_id
-    
-    async def create_inbound_agent(self, agent_config: Dict[str, Any]) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = await client.post(
-                f"{self.base_url}/agents",
-                headers=headers,
-                json=agent_config,
-                timeout=30.0
-            )
-            
-            if response.status_code == 201:
-                return response.json()
-            else:
-                raise Exception(f"Failed to create agent: {response.status_code} - {response.text}")
-    
-    async def configure_call_workflow(self, workflow_config: Dict[str, Any]) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = await client.post(
-                f"{self.base_url}/workflows",
-                headers=headers,
-                json=workflow_config,
-                timeout=30.0
-            )
-            
-            if response.status_code in [200, 201]:
-                return response.json()
-            else:
-                raise Exception(f"Failed to configure workflow: {response.status_code} - {response.text}")
-    
-    def get_agent_prompt(self) -> str:
-        return """
+_AGENT_PROMPT = """
         You are a professional freight broker assistant handling inbound calls from truck drivers and carriers looking for loads.
 
         Your primary objectives are:
@@ -81,8 +36,176 @@ class HappyRobotService:
 
         Remember: You represent a professional freight brokerage. Maintain high standards of service while protecting business interests.
         """
+
+
+# Transient upstream statuses worth retrying; anything else returns as-is
+_RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+_RETRY_MAX_ATTEMPTS = 5
+
+# Client-side pacing for platform calls: stay under the upstream rate limit
+# instead of burning attempts on 429s
+_RATE_LIMIT_CALLS = 600
+_RATE_LIMIT_PERIOD_SECONDS = 60.0
+
+# Transcripts are immutable once a call ends; entries older than this are
+# served stale while a background refresh runs (stale-while-revalidate)
+_TRANSCRIPT_FRESH_SECONDS = 3600.0
+_TRANSCRIPT_CACHE_MAX_ENTRIES = 10_000
+
+
+class _TokenBucket:
+    """Minimal async token bucket (capacity tokens refilled over the period)"""
+
+    def __init__(self, capacity: int, period_seconds: float):
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._fill_rate = capacity / period_seconds
+        self._timestamp = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity,
+                                   self._tokens + (now - self._timestamp) * self._fill_rate)
+                self._timestamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
+
+
+class HappyRobotService:
+
+    def __init__(self):
+        self.base_url = "https://platform.happyrobot.ai/api/v1"
+        self.api_key = settings.happyrobot_api_key
+        self.agent_id = settings.happyrobot_agent_id
+        self.org_id = settings.happyrobot_org_id
+        self.workflow_id = settings.happyrobot_workflow_id
+        self._auth_headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._workflow_config: Optional[Dict[str, Any]] = None
+        self._workflow_config_bytes: Optional[bytes] = None
+        self._limiter = _TokenBucket(_RATE_LIMIT_CALLS, _RATE_LIMIT_PERIOD_SECONDS)
+        self._transcript_cache: Dict[str, tuple] = {}  # call_id -> (fetched_at, transcript)
+        self._transcript_refreshes: Dict[str, asyncio.Task] = {}  # in-flight revalidations
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # One long-lived client: each per-call AsyncClient paid a fresh
+        # TCP+TLS handshake to the platform
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                http2=True,  # concurrent platform calls multiplex one connection
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=30)
+            )
+        return self._client
+
+    async def aclose(self):
+        """Release the pooled connections (called from app shutdown)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+    async def _request_with_retry(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Issue a request, retrying transient 429/5xx with backoff + jitter"""
+        delay = 0.25
+        for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+            # Every attempt (including retries) consumes a rate-limit token
+            await self._limiter.acquire()
+            response = None
+            try:
+                response = await self._get_client().request(method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt == _RETRY_MAX_ATTEMPTS:
+                    raise
+
+            if response is not None:
+                if response.status_code not in _RETRY_STATUS_CODES or attempt == _RETRY_MAX_ATTEMPTS:
+                    return response
+
+            # Honor an upstream Retry-After when given; otherwise back off
+            # exponentially with jitter so synchronized callers don't
+            # re-stampede the platform
+            sleep_for = delay + random.uniform(0, delay)
+            if response is not None:
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    sleep_for = float(retry_after)
+            await asyncio.sleep(sleep_for)
+            delay = min(delay * 2, 5.0)
+
+    async def bootstrap(self, agent_config: Dict[str, Any],
+                        workflow_config: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        Run the independent platform setup calls concurrently
+
+        Agent creation and workflow configuration don't consume each
+        other's results, so setup wall time is the slower call rather than
+        the sum. Returns (agent_result, workflow_result); either element
+        may be an Exception so one failure doesn't cancel the other.
+        """
+        results = await asyncio.gather(
+            self.create_inbound_agent(agent_config),
+            self.configure_call_workflow(workflow_config),
+            return_exceptions=True
+        )
+        return tuple(results)
+
+    async def create_inbound_agent(self, agent_config: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._request_with_retry(
+            "POST",
+            f"{self.base_url}/agents",
+            headers=self._auth_headers,
+            content=orjson.dumps(agent_config)
+        )
+
+        if response.status_code == 201:
+            return response.json()
+        else:
+            raise Exception(f"Failed to create agent: {response.status_code} - {response.text}")
+
+    async def configure_call_workflow(self, workflow_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # The service's own workflow definition is static per process, so its
+        # JSON bytes are encoded exactly once; ad-hoc configs encode per call
+        if workflow_config is None or workflow_config is self._workflow_config:
+            content = self.get_workflow_config_bytes()
+        else:
+            content = orjson.dumps(workflow_config)
+
+        response = await self._request_with_retry(
+            "POST",
+            f"{self.base_url}/workflows",
+            headers=self._auth_headers,
+            content=content
+        )
+
+        if response.status_code in [200, 201]:
+            return response.json()
+        else:
+            raise Exception(f"Failed to configure workflow: {response.status_code} - {response.text}")
+    
+    def get_agent_prompt(self) -> str:
+        return _AGENT_PROMPT
     
     def get_workflow_config(self) -> Dict[str, Any]:
+        # Built once per instance: settings and the API key are fixed for
+        # the process, so the descriptor dicts need no rebuilding per call
+        if self._workflow_config is None:
+            self._workflow_config = self._build_workflow_config()
+        return self._workflow_config
+
+    def get_workflow_config_bytes(self) -> bytes:
+        if self._workflow_config_bytes is None:
+            self._workflow_config_bytes = orjson.dumps(self.get_workflow_config())
+        return self._workflow_config_bytes
+
+    def _build_workflow_config(self) -> Dict[str, Any]:
+        function_headers = create_api_key_header()
         return {
             "name": "Inbound Carrier Sales Agent",
             "description": "AI agent for handling inbound carrier calls and load booking",
@@ -95,39 +218,39 @@ class HappyRobotService:
                     "description": "Verify carrier MC number with FMCSA",
                     "endpoint": f"{settings.webhook_url}/api/v1/carriers/{'{mc_number}'}/verify-and-update",
                     "method": "POST",
-                    "headers": create_api_key_header()
+                    "headers": function_headers
                 },
                 {
                     "name": "search_loads",
-                    "description": "Search for available loads matching carrier criteria",
-                    "endpoint": f"{settings.webhook_url}/api/v1/loads/search",
+                    "description": "Search for available loads and get pitch-ready summaries",
+                    "endpoint": f"{settings.webhook_url}/api/v1/loads/search/pitch",
                     "method": "POST",
-                    "headers": create_api_key_header()
+                    "headers": function_headers
                 },
                 {
                     "name": "evaluate_offer",
                     "description": "Evaluate carrier's counter offer",
                     "endpoint": f"{settings.webhook_url}/api/v1/negotiations/{'{negotiation_id}'}/evaluate",
                     "method": "POST",
-                    "headers": create_api_key_header()
+                    "headers": function_headers
                 },
                 {
                     "name": "create_call_record",
                     "description": "Create call record for tracking",
                     "endpoint": f"{settings.webhook_url}/api/v1/calls/",
                     "method": "POST", 
-                    "headers": create_api_key_header()
+                    "headers": function_headers
                 },
                 {
                     "name": "start_negotiation",
                     "description": "Start price negotiation for a load",
                     "endpoint": f"{settings.webhook_url}/api/v1/negotiations/",
                     "method": "POST",
-                    "headers": create_api_key_header()
+                    "headers": function_headers
                 }
             ],
             "settings": {
-                "max_call_duration": 600
+                "max_call_duration": 600,
                 "enable_recording": True,
                 "enable_transcription": True,
                 "language": "en-US",
@@ -139,65 +262,86 @@ class HappyRobotService:
     async def trigger_web_call(self, phone_number: str = None) -> Dict[str, Any]:
         if not self.workflow_id:
             raise Exception("Workflow ID not configured. Please set HAPPYROBOT_WORKFLOW_ID in environment.")
-        
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Content-Type": "application/json"
-            }
-            
-            webhook_endpoint = f"https://workflows.platform.happyrobot.ai/hooks/{self.workflow_id}"
-            
-            call_config = {
-                "trigger_type": "web_call",
-                "organization_id": self.org_id,
-                "phone_number": phone_number if phone_number else "+15551234567"
-            }
-            
-            try:
-                response = await client.post(
-                    webhook_endpoint,
-                    headers=headers,
-                    json=call_config,
-                    timeout=10.0
-                )
-                
-                if response.status_code in [200, 201]:
-                    result = response.json() if response.content else {"status": "success"}
-                    return {
-                        "endpoint_used": webhook_endpoint,
-                        "response": result,
-                        "use_case_id": self.workflow_id,
-                        "organization_id": self.org_id,
-                        "status": "triggered"
-                    }
-                else:
-                    return {
-                        "endpoint_used": webhook_endpoint,
-                        "error": f"API returned status {response.status_code}",
-                        "response": response.text
-                    }
-                        
-            except Exception as e:
+
+        webhook_endpoint = f"https://workflows.platform.happyrobot.ai/hooks/{self.workflow_id}"
+
+        call_config = {
+            "trigger_type": "web_call",
+            "organization_id": self.org_id,
+            "phone_number": phone_number if phone_number else "+15551234567"
+        }
+
+        try:
+            response = await self._request_with_retry(
+                "POST",
+                webhook_endpoint,
+                headers={"Content-Type": "application/json"},
+                content=orjson.dumps(call_config),
+                timeout=10.0
+            )
+
+            if response.status_code in [200, 201]:
+                result = response.json() if response.content else {"status": "success"}
                 return {
                     "endpoint_used": webhook_endpoint,
-                    "error": f"Request failed: {str(e)}"
+                    "response": result,
+                    "use_case_id": self.workflow_id,
+                    "organization_id": self.org_id,
+                    "status": "triggered"
                 }
+            else:
+                return {
+                    "endpoint_used": webhook_endpoint,
+                    "error": f"API returned status {response.status_code}",
+                    "response": response.text
+                }
+
+        except Exception as e:
+            return {
+                "endpoint_used": webhook_endpoint,
+                "error": f"Request failed: {str(e)}"
+            }
     
     async def get_call_transcript(self, call_id: str) -> Optional[str]:
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = await client.get(
-                f"{self.base_url}/calls/{call_id}/transcript",
-                headers=headers,
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("transcript")
-            else:
-                return None
\ No newline at end of file
+        cached = self._transcript_cache.get(call_id)
+        if cached:
+            fetched_at, transcript = cached
+            if (time.monotonic() - fetched_at >= _TRANSCRIPT_FRESH_SECONDS
+                    and call_id not in self._transcript_refreshes):
+                # Serve the stale copy immediately; refresh out of band.
+                # The task reference is held in _transcript_refreshes (bare
+                # create_task results can be garbage-collected mid-flight)
+                # and doubles as the in-flight marker so a hot stale entry
+                # triggers one refresh, not one per request.
+                task = asyncio.create_task(self._refresh_transcript(call_id))
+                self._transcript_refreshes[call_id] = task
+                task.add_done_callback(
+                    lambda _task, call_id=call_id: self._transcript_refreshes.pop(call_id, None)
+                )
+            return transcript
+
+        return await self._fetch_transcript(call_id)
+
+    async def _fetch_transcript(self, call_id: str) -> Optional[str]:
+        response = await self._request_with_retry(
+            "GET",
+            f"{self.base_url}/calls/{call_id}/transcript",
+            headers=self._auth_headers
+        )
+
+        if response.status_code != 200:
+            return None
+
+        transcript = response.json().get("transcript")
+        if transcript is not None:
+            if len(self._transcript_cache) >= _TRANSCRIPT_CACHE_MAX_ENTRIES:
+                self._transcript_cache.clear()
+            self._transcript_cache[call_id] = (time.monotonic(), transcript)
+        return transcript
+
+    async def _refresh_transcript(self, call_id: str):
+        try:
+            await self._fetch_transcript(call_id)
+        except Exception:
+            # A failed refresh keeps the stale entry in place
+            pass
\ No newline at end of file
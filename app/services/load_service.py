@@ -1,14 +1,39 @@
 """
 Service layer for load management operations
 """
+from functools import lru_cache
 from typing import List, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from app.models.load import Load, LoadCreate, LoadUpdate, LoadMatch
+from sqlalchemy import and_, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from app.database.inserts import insert_ignoring_conflicts
+from app.database.pagination import paginate
+from app.models.load import Load, LoadCreate, LoadUpdate, LoadMatch, LoadPitch
 from app.models.carrier import Carrier
 
 
+@lru_cache(maxsize=1024)
+def _format_summary_cached(load_id, origin, destination, pickup_datetime, delivery_datetime,
+                           miles, equipment_type, loadboard_rate, commodity_type, weight, notes,
+                           updated_at):
+    # Repeat pitches of the same load during a negotiation skip the
+    # strftime/number-formatting work; updated_at participates in the key
+    # purely so edits to a load invalidate its cached summary
+    return LoadPitch(
+        load_id=load_id,
+        route=f"{origin} to {destination}",
+        pickup_date=pickup_datetime.strftime("%B %d, %Y"),
+        delivery_date=delivery_datetime.strftime("%B %d, %Y"),
+        distance=f"{miles} miles" if miles else "Distance TBD",
+        equipment=equipment_type,
+        rate=f"${loadboard_rate:,.2f}",
+        commodity=commodity_type,
+        weight=f"{weight:,} lbs" if weight else "Weight TBD",
+        special_notes=notes or "No special requirements"
+    )
+
+
 class LoadService:
     """Service class for load-related business logic"""
     
@@ -23,14 +48,55 @@ class LoadService:
             load_data: Load creation data
             
         Returns:
-            Load: Created load record
+            Load: Created load record, or None if the load ID is taken
         """
-        db_load = Load(**load_data.model_dump())
-        self.db.add(db_load)
+        # INSERT ... RETURNING brings back the row with its server defaults,
+        # so no post-commit refresh SELECT is needed
+        stmt = insert(Load).values(**load_data.model_dump()).returning(Load)
+        try:
+            db_load = self.db.execute(stmt).scalars().first()
+        except IntegrityError:
+            # Duplicate load_id: single atomic INSERT instead of a racy
+            # get-then-insert pre-check
+            self.db.rollback()
+            return None
         self.db.commit()
-        self.db.refresh(db_load)
         return db_load
     
+    def create_loads(self, load_datas: List[LoadCreate]) -> List[str]:
+        """
+        Create a batch of loads with one multi-row INSERT
+
+        Rows whose load_id already exists (or repeats within the batch)
+        are skipped, so feed imports can be replayed safely.
+
+        Args:
+            load_datas: Load creation data for each row
+
+        Returns:
+            List[str]: load_ids actually inserted
+        """
+        if not load_datas:
+            return []
+
+        existing_ids = {
+            row[0] for row in self.db.query(Load.load_id)
+            .filter(Load.load_id.in_([ld.load_id for ld in load_datas]))
+        }
+        rows = []
+        seen_ids = set(existing_ids)
+        for load_data in load_datas:
+            if load_data.load_id not in seen_ids:
+                seen_ids.add(load_data.load_id)
+                rows.append(load_data.model_dump())
+
+        if rows:
+            # ON CONFLICT DO NOTHING covers ids inserted between the
+            # existence check and this statement
+            insert_ignoring_conflicts(self.db, Load, rows, index_elements=["load_id"])
+            self.db.commit()
+        return [row["load_id"] for row in rows]
+
     def get_load(self, load_id: str) -> Optional[Load]:
         """
         Get a load by ID
@@ -41,25 +107,47 @@ class LoadService:
         Returns:
             Load: Load record or None if not found
         """
-        return self.db.query(Load).filter(Load.load_id == load_id).first()
+        # Session.get checks the identity map before touching the DB, so
+        # repeat lookups of the same load within a request are free
+        return self.db.get(Load, load_id)
     
-    def get_loads(self, skip: int = 0, limit: int = 100, available_only: bool = True) -> List[Load]:
+    def get_loads(self, skip: int = 0, limit: int = 100, available_only: bool = True,
+                  after: Optional[tuple] = None) -> tuple:
         """
         Get multiple loads with pagination
-        
+
         Args:
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when after is given)
             limit: Maximum number of records to return
             available_only: Whether to filter for available loads only
-            
+            after: Optional (loadboard_rate, load_id) keyset cursor; pages
+                   after it seek directly instead of discarding skip rows
+
         Returns:
-            List[Load]: List of load records
+            tuple: (loads, total) with the page and the overall match count
         """
         query = self.db.query(Load)
         if available_only:
             query = query.filter(Load.is_available == True)
-        
-        return query.offset(skip).limit(limit).all()
+
+        if after is not None:
+            # Keyset page: the total still counts the whole collection (to
+            # match the offset pages), so it comes from its own query
+            # rather than a window over the cursor-filtered rows
+            after_rate, after_id = after
+            rows = (query.filter(or_(
+                        Load.loadboard_rate < after_rate,
+                        and_(Load.loadboard_rate == after_rate, Load.load_id > after_id)
+                    ))
+                    .order_by(Load.loadboard_rate.desc(), Load.load_id)
+                    .limit(limit)
+                    .all())
+            return rows, query.count()
+
+        # Deterministic ordering (highest-paying first) so pages are stable
+        query = query.order_by(Load.loadboard_rate.desc(), Load.load_id)
+
+        return paginate(query, skip, limit)
     
     def update_load(self, load_id: str, load_update: LoadUpdate) -> Optional[Load]:
         """
@@ -72,17 +160,15 @@ class LoadService:
         Returns:
             Load: Updated load record or None if not found
         """
-        db_load = self.get_load(load_id)
-        if not db_load:
-            return None
-        
-        update_data = load_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_load, field, value)
-        
-        db_load.updated_at = datetime.utcnow()
+        # One UPDATE ... RETURNING instead of select-mutate-commit-refresh
+        stmt = (update(Load)
+                .where(Load.load_id == load_id)
+                .values(updated_at=datetime.utcnow(), **load_update.model_dump(exclude_unset=True))
+                .returning(Load))
+        db_load = self.db.execute(
+            stmt, execution_options={"synchronize_session": False, "populate_existing": True}
+        ).scalars().first()
         self.db.commit()
-        self.db.refresh(db_load)
         return db_load
     
     def delete_load(self, load_id: str) -> bool:
@@ -140,6 +226,17 @@ class LoadService:
         
         return query.limit(10).all()  # Return top 10 matches
     
+    def find_matching_load_summaries(self, carrier_location: str, match_criteria: LoadMatch) -> List[LoadPitch]:
+        """
+        Find matching loads and return them pitch-formatted
+
+        Fuses the search and per-load summary steps so the AI agent gets
+        its final payload in one webhook leg instead of a search followed
+        by a summary call per load.
+        """
+        return [self._format_summary(load)
+                for load in self.find_matching_loads(carrier_location, match_criteria)]
+
     def assign_load_to_carrier(self, load_id: str, carrier_mc: str, final_rate: float) -> Optional[Load]:
         """
         Assign a load to a carrier with final negotiated rate
@@ -152,14 +249,24 @@ class LoadService:
         Returns:
             Load: Updated load record or None if not found
         """
-        update_data = LoadUpdate(
-            assigned_carrier_mc=carrier_mc,
-            final_rate=final_rate,
-            is_available=False
-        )
-        return self.update_load(load_id, update_data)
+        # Single UPDATE ... RETURNING instead of the select-then-mutate
+        # round-trip through update_load
+        stmt = (update(Load)
+                .where(Load.load_id == load_id)
+                .values(
+                    assigned_carrier_mc=carrier_mc,
+                    final_rate=final_rate,
+                    is_available=False,
+                    updated_at=datetime.utcnow()
+                )
+                .returning(Load))
+        db_load = self.db.execute(
+            stmt, execution_options={"synchronize_session": False, "populate_existing": True}
+        ).scalars().first()
+        self.db.commit()
+        return db_load
     
-    def get_load_summary_for_pitch(self, load_id: str) -> Optional[dict]:
+    def get_load_summary_for_pitch(self, load_id: str) -> Optional[LoadPitch]:
         """
         Get formatted load information for AI agent to pitch to carrier
         
@@ -167,21 +274,35 @@ class LoadService:
             load_id: Load identifier
             
         Returns:
-            dict: Formatted load summary for AI agent
+            LoadPitch: Formatted load summary for AI agent
         """
         load = self.get_load(load_id)
         if not load:
             return None
-        
-        return {
-            "load_id": load.load_id,
-            "route": f"{load.origin} to {load.destination}",
-            "pickup_date": load.pickup_datetime.strftime("%B %d, %Y"),
-            "delivery_date": load.delivery_datetime.strftime("%B %d, %Y"),
-            "distance": f"{load.miles} miles" if load.miles else "Distance TBD",
-            "equipment": load.equipment_type,
-            "rate": f"${load.loadboard_rate:,.2f}",
-            "commodity": load.commodity_type,
-            "weight": f"{load.weight:,} lbs" if load.weight else "Weight TBD",
-            "special_notes": load.notes or "No special requirements"
-        }
\ No newline at end of file
+
+        return self._format_summary(load)
+
+    def get_load_summaries_for_pitch(self, load_ids: List[str]) -> List[LoadPitch]:
+        """
+        Get formatted summaries for several loads in one query
+
+        Args:
+            load_ids: Load identifiers to summarize
+
+        Returns:
+            List[LoadPitch]: Formatted summaries, one per load found
+        """
+        # One SELECT ... WHERE load_id IN (...) instead of a round-trip per
+        # load when the agent pitches a multi-load list
+        loads = self.db.query(Load).filter(Load.load_id.in_(load_ids)).all()
+        return [self._format_summary(load) for load in loads]
+
+    @staticmethod
+    def _format_summary(load: Load) -> LoadPitch:
+        return _format_summary_cached(
+            load.load_id, load.origin, load.destination,
+            load.pickup_datetime, load.delivery_datetime,
+            load.miles, load.equipment_type, load.loadboard_rate,
+            load.commodity_type, load.weight, load.notes,
+            load.updated_at
+        )
\ No newline at end of file
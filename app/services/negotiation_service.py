@@ -4,13 +4,23 @@ Service layer for negotiation management and pricing logic
 from typing import Optional, List
 from datetime import datetime, timedelta
 from decimal import Decimal
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, or_, update
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.exc import IntegrityError
+from app.database.inserts import insert_ignoring_conflicts
 from app.models.negotiation import (
     Negotiation, NegotiationCreate, NegotiationUpdate, 
     NegotiationStatus, OfferType, NegotiationDecision
 )
 
 
+# Pricing constants hoisted out of evaluate_carrier_offer: Decimal parses
+# its string argument on every construction
+_THRESHOLD_NORMAL = Decimal("0.95")       # accept within 5% of the board rate
+_THRESHOLD_FINAL_ROUND = Decimal("0.90")  # loosen to 10% in the last round
+_HALF = Decimal("0.5")
+
+
 class NegotiationService:
     """Service class for negotiation-related business logic"""
     
@@ -25,17 +35,66 @@ class NegotiationService:
             negotiation_data: Negotiation creation data
             
         Returns:
-            Negotiation: Created negotiation record
+            Negotiation: Created negotiation record, or None if the ID is taken
         """
-        db_negotiation = Negotiation(**negotiation_data.model_dump())
-        # Set expiration time (24 hours from creation)
-        db_negotiation.expires_at = datetime.utcnow() + timedelta(hours=24)
-        
-        self.db.add(db_negotiation)
+        data = negotiation_data.model_dump()
+        # Set expiration time (24 hours from creation) and denormalize the
+        # acceptance thresholds once
+        data["expires_at"] = datetime.utcnow() + timedelta(hours=24)
+        data["min_acceptable_rate"] = negotiation_data.original_rate * _THRESHOLD_NORMAL
+        data["final_round_min_rate"] = negotiation_data.original_rate * _THRESHOLD_FINAL_ROUND
+
+        # INSERT ... RETURNING brings back the row with its server defaults,
+        # so no post-commit refresh SELECT is needed
+        stmt = insert(Negotiation).values(**data).returning(Negotiation)
+        try:
+            db_negotiation = self.db.execute(stmt).scalars().first()
+        except IntegrityError:
+            # Duplicate negotiation_id: single atomic INSERT instead of a racy
+            # get-then-insert pre-check
+            self.db.rollback()
+            return None
         self.db.commit()
-        self.db.refresh(db_negotiation)
         return db_negotiation
     
+    def create_negotiations(self, negotiation_datas: List[NegotiationCreate]) -> List[str]:
+        """
+        Create a batch of negotiations with one multi-row INSERT
+
+        Expiry and acceptance thresholds are computed per row exactly as
+        in create_negotiation; ids that already exist (or repeat within
+        the batch) are skipped so imports replay safely.
+
+        Returns:
+            List[str]: negotiation_ids actually inserted
+        """
+        if not negotiation_datas:
+            return []
+
+        existing_ids = {
+            row[0] for row in self.db.query(Negotiation.negotiation_id)
+            .filter(Negotiation.negotiation_id.in_([n.negotiation_id for n in negotiation_datas]))
+        }
+        expires_at = datetime.utcnow() + timedelta(hours=24)
+        rows = []
+        seen_ids = set(existing_ids)
+        for negotiation_data in negotiation_datas:
+            if negotiation_data.negotiation_id in seen_ids:
+                continue
+            seen_ids.add(negotiation_data.negotiation_id)
+            data = negotiation_data.model_dump()
+            data["expires_at"] = expires_at
+            data["min_acceptable_rate"] = negotiation_data.original_rate * _THRESHOLD_NORMAL
+            data["final_round_min_rate"] = negotiation_data.original_rate * _THRESHOLD_FINAL_ROUND
+            rows.append(data)
+
+        if rows:
+            # ON CONFLICT DO NOTHING covers ids inserted between the
+            # existence check and this statement
+            insert_ignoring_conflicts(self.db, Negotiation, rows, index_elements=["negotiation_id"])
+            self.db.commit()
+        return [row["negotiation_id"] for row in rows]
+
     def get_negotiation(self, negotiation_id: str) -> Optional[Negotiation]:
         """
         Get a negotiation by ID
@@ -46,9 +105,10 @@ class NegotiationService:
         Returns:
             Negotiation: Negotiation record or None if not found
         """
-        return self.db.query(Negotiation).filter(
-            Negotiation.negotiation_id == negotiation_id
-        ).first()
+        # negotiation_id is the primary key; Session.get checks the identity
+        # map first, so the repeat lookups a state transition makes within
+        # one request skip SQL entirely
+        return self.db.get(Negotiation, negotiation_id)
     
     def get_active_negotiation_for_call(self, call_id: str) -> Optional[Negotiation]:
         """
@@ -77,61 +137,91 @@ class NegotiationService:
         Returns:
             Negotiation: Updated negotiation record or None if not found
         """
-        db_negotiation = self.get_negotiation(negotiation_id)
-        if not db_negotiation:
-            return None
-        
-        update_data = negotiation_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_negotiation, field, value)
-        
-        db_negotiation.updated_at = datetime.utcnow()
+        # One UPDATE ... RETURNING carrying exactly the provided fields
+        # (read off the fields-set view, skipping a model_dump pass) instead
+        # of select-mutate-commit-refresh
+        patch = {field: getattr(negotiation_update, field)
+                 for field in negotiation_update.__pydantic_fields_set__}
+        stmt = (update(Negotiation)
+                .where(Negotiation.negotiation_id == negotiation_id)
+                .values(updated_at=datetime.utcnow(), **patch)
+                .returning(Negotiation))
+        db_negotiation = self.db.execute(
+            stmt, execution_options={"synchronize_session": False, "populate_existing": True}
+        ).scalars().first()
         self.db.commit()
-        self.db.refresh(db_negotiation)
         return db_negotiation
     
-    def make_counter_offer(self, negotiation_id: str, offer_amount: Decimal, 
+    def _apply_update(self, db_negotiation: Negotiation,
+                      negotiation_update: NegotiationUpdate) -> Negotiation:
+        """Apply an update to an already-loaded row and commit once
+
+        The transition methods load the negotiation a single time; routing
+        their writes back through update_negotiation would re-SELECT the
+        same row and commit a second time.
+        """
+        for field in negotiation_update.__pydantic_fields_set__:
+            setattr(db_negotiation, field, getattr(negotiation_update, field))
+        db_negotiation.updated_at = datetime.utcnow()
+        self.db.commit()
+        return db_negotiation
+
+    def make_counter_offer(self, negotiation_id: str, offer_amount: Decimal,
                           offer_by: str, carrier_feedback: str = None) -> Optional[Negotiation]:
         """
         Make a counter offer in negotiation
-        
+
         Args:
             negotiation_id: Negotiation identifier
             offer_amount: New offer amount
             offer_by: Who is making the offer ('broker' or 'carrier')
             carrier_feedback: Optional feedback from carrier
-            
+
         Returns:
             Negotiation: Updated negotiation or None if not found/invalid
         """
+        # Atomic compare-and-swap: expiry, round-limit and state checks ride
+        # in the UPDATE's WHERE clause, so concurrent counter offers
+        # serialize in the database instead of both passing Python-side
+        # checks and double-incrementing the round
+        now = datetime.utcnow()
+        values = {
+            "current_round": Negotiation.current_round + 1,
+            "current_offer_amount": offer_amount,
+            "current_offer_by": offer_by,
+            "current_offer_type": OfferType.COUNTER.value,
+            "updated_at": now,
+        }
+        if carrier_feedback:
+            values["carrier_feedback"] = carrier_feedback
+
+        stmt = (update(Negotiation)
+                .where(
+                    Negotiation.negotiation_id == negotiation_id,
+                    Negotiation.status == NegotiationStatus.ACTIVE.value,
+                    or_(Negotiation.expires_at.is_(None), Negotiation.expires_at >= now),
+                    Negotiation.current_round < Negotiation.max_rounds
+                )
+                .values(**values)
+                .returning(Negotiation))
+        negotiation = self.db.execute(
+            stmt, execution_options={"synchronize_session": False, "populate_existing": True}
+        ).scalars().first()
+        self.db.commit()
+        if negotiation is not None:
+            return negotiation
+
+        # Slow path: the guarded UPDATE matched nothing - classify why and
+        # close out the negotiation where that is the correct transition
         negotiation = self.get_negotiation(negotiation_id)
         if not negotiation or negotiation.status != NegotiationStatus.ACTIVE:
             return None
-        
-        # Check if negotiation has expired
-        if negotiation.expires_at and negotiation.expires_at < datetime.utcnow():
-            self.update_negotiation(negotiation_id, 
-                                  NegotiationUpdate(status=NegotiationStatus.EXPIRED))
-            return None
-        
-        # Check if max rounds exceeded
-        if negotiation.current_round >= negotiation.max_rounds:
-            self.update_negotiation(negotiation_id, 
-                                  NegotiationUpdate(status=NegotiationStatus.REJECTED))
-            return None
-        
-        # Update with counter offer
-        update_data = NegotiationUpdate(
-            current_round=negotiation.current_round + 1,
-            current_offer_amount=offer_amount,
-            current_offer_by=offer_by,
-            current_offer_type=OfferType.COUNTER
-        )
-        
-        if carrier_feedback:
-            update_data.carrier_feedback = carrier_feedback
-        
-        return self.update_negotiation(negotiation_id, update_data)
+
+        if negotiation.expires_at and negotiation.expires_at < now:
+            self._apply_update(negotiation, NegotiationUpdate(status=NegotiationStatus.EXPIRED))
+        elif negotiation.current_round >= negotiation.max_rounds:
+            self._apply_update(negotiation, NegotiationUpdate(status=NegotiationStatus.REJECTED))
+        return None
     
     def accept_offer(self, negotiation_id: str, final_rate: Decimal) -> Optional[Negotiation]:
         """
@@ -144,12 +234,15 @@ class NegotiationService:
         Returns:
             Negotiation: Updated negotiation or None if not found
         """
-        update_data = NegotiationUpdate(
+        negotiation = self.get_negotiation(negotiation_id)
+        if not negotiation:
+            return None
+
+        return self._apply_update(negotiation, NegotiationUpdate(
             status=NegotiationStatus.ACCEPTED,
             final_agreed_rate=final_rate,
             current_offer_type=OfferType.FINAL
-        )
-        return self.update_negotiation(negotiation_id, update_data)
+        ))
     
     def reject_offer(self, negotiation_id: str, reason: str = None) -> Optional[Negotiation]:
         """
@@ -162,14 +255,18 @@ class NegotiationService:
         Returns:
             Negotiation: Updated negotiation or None if not found
         """
+        negotiation = self.get_negotiation(negotiation_id)
+        if not negotiation:
+            return None
+
         update_data = NegotiationUpdate(
             status=NegotiationStatus.REJECTED
         )
-        
+
         if reason:
             update_data.broker_notes = reason
-        
-        return self.update_negotiation(negotiation_id, update_data)
+
+        return self._apply_update(negotiation, update_data)
     
     def evaluate_carrier_offer(self, negotiation_id: str, 
                               carrier_offer: Decimal) -> NegotiationDecision:
@@ -183,7 +280,18 @@ class NegotiationService:
         Returns:
             NegotiationDecision: Decision on how to respond
         """
-        negotiation = self.get_negotiation(negotiation_id)
+        # Read-only decision path: hydrate just the pricing columns instead
+        # of the full row (notes, feedback and timestamps go unused here)
+        negotiation = (self.db.query(Negotiation)
+                       .options(load_only(
+                           Negotiation.original_rate,
+                           Negotiation.current_round,
+                           Negotiation.max_rounds,
+                           Negotiation.min_acceptable_rate,
+                           Negotiation.final_round_min_rate
+                       ))
+                       .filter(Negotiation.negotiation_id == negotiation_id)
+                       .first())
         if not negotiation:
             return NegotiationDecision(
                 should_accept=False,
@@ -195,13 +303,13 @@ class NegotiationService:
         current_round = negotiation.current_round
         max_rounds = negotiation.max_rounds
         
-        # Calculate acceptable thresholds
-        # Accept if offer is within 5% of original rate
-        min_acceptable = original_rate * Decimal("0.95")
-        
-        # Be more flexible in later rounds
+        # Acceptance thresholds: read the values precomputed at creation,
+        # falling back to the arithmetic for rows predating the columns.
+        # Accept within 5% of original rate, loosening to 10% in later rounds
         if current_round >= max_rounds - 1:
-            min_acceptable = original_rate * Decimal("0.90")  # 10% discount max
+            min_acceptable = negotiation.final_round_min_rate or (original_rate * _THRESHOLD_FINAL_ROUND)
+        else:
+            min_acceptable = negotiation.min_acceptable_rate or (original_rate * _THRESHOLD_NORMAL)
         
         if carrier_offer >= min_acceptable:
             return NegotiationDecision(
@@ -219,8 +327,9 @@ class NegotiationService:
                 is_final_offer=True
             )
         
-        # Calculate counter offer (split the difference)
-        counter_offer = (carrier_offer + original_rate) / 2
+        # Calculate counter offer (split the difference); multiplying by the
+        # cached half is cheaper than Decimal division
+        counter_offer = (carrier_offer + original_rate) * _HALF
         counter_offer = max(counter_offer, min_acceptable)  # Don't go below minimum
         
         return NegotiationDecision(
@@ -252,16 +361,16 @@ class NegotiationService:
         Returns:
             int: Number of negotiations expired
         """
-        expired_negotiations = (self.db.query(Negotiation)
-                               .filter(
-                                   Negotiation.status == NegotiationStatus.ACTIVE,
-                                   Negotiation.expires_at < datetime.utcnow()
-                               )
-                               .all())
-        
-        for negotiation in expired_negotiations:
-            negotiation.status = NegotiationStatus.EXPIRED
-            negotiation.updated_at = datetime.utcnow()
-        
+        # One bulk UPDATE instead of hydrating every expired row and
+        # mutating it in Python; the same timestamp serves predicate and
+        # assignment so the cutoff is consistent
+        now = datetime.utcnow()
+        stmt = (update(Negotiation)
+                .where(
+                    Negotiation.status == NegotiationStatus.ACTIVE,
+                    Negotiation.expires_at < now
+                )
+                .values(status=NegotiationStatus.EXPIRED.value, updated_at=now))
+        result = self.db.execute(stmt, execution_options={"synchronize_session": False})
         self.db.commit()
-        return len(expired_negotiations)
\ No newline at end of file
+        return result.rowcount
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Seed the API with demo calls and negotiations for dashboard testing
+
+Run against a local server:
+    python demo_data.py
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = os.environ.get("DEMO_BASE_URL", "http://localhost:8000")
+API_KEY = os.environ.get("API_KEY", "dev-api-key-change-in-production")
+
+# One pooled session for the whole run: a bare requests.post per record
+# would pay a fresh TCP(+TLS) handshake every time
+session = requests.Session()
+session.headers.update({
+    "Authorization": f"Bearer {API_KEY}",
+    "Content-Type": "application/json",
+})
+_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+)
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
+
+_now = datetime.utcnow()
+
+SAMPLE_CALLS = [
+    {
+        "call_id": f"demo_call_{i}",
+        "carrier_mc_number": mc,
+        "start_time": _now - timedelta(hours=i),  # orjson serializes datetimes directly
+        "happyrobot_call_id": f"demo_hr_{i}",
+    }
+    for i, mc in enumerate(["123456", "789012", "456789", "999888"], start=1)
+]
+
+SAMPLE_NEGOTIATIONS = [
+    {
+        "negotiation_id": f"demo_neg_{i}",
+        "call_id": f"demo_call_{i}",
+        "load_id": load_id,
+        "carrier_mc_number": call["carrier_mc_number"],
+        "current_offer_amount": offer,
+        "current_offer_by": "carrier",
+        "current_offer_type": "initial",
+        "original_rate": rate,
+    }
+    for i, (call, load_id, offer, rate) in enumerate(
+        zip(SAMPLE_CALLS, ["LD001", "LD002", "LD003"], ["1450.00", "2100.00", "1700.00"],
+            ["1500.00", "2200.00", "1800.00"]),
+        start=1,
+    )
+]
+
+
+def wait_for_server(max_attempts: int = 10) -> bool:
+    """Probe the health endpoint, sleeping only while the server is down
+
+    Short-timeout attempts over the warm session replace a fixed startup
+    sleep: an already-running server answers on the first probe.
+    """
+    for _ in range(max_attempts):
+        try:
+            session.get(f"{BASE_URL}/health", timeout=0.25)
+            return True
+        except (requests.ConnectionError, requests.Timeout):
+            time.sleep(0.2)
+    return False
+
+
+def post_batch(path, payloads):
+    # One bulk request per record type: data= with orjson-encoded bytes
+    # skips the stdlib json.dumps the json= kwarg would run
+    response = session.post(f"{BASE_URL}{path}", data=orjson.dumps(payloads))
+    return path, response.status_code, response.json()
+
+
+def main():
+    if not wait_for_server():
+        print(f"Server not reachable at {BASE_URL}")
+        return
+
+    # The two batches are independent, so dispatch them concurrently over
+    # the pooled connections
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(post_batch, "/api/v1/calls/bulk", SAMPLE_CALLS),
+            executor.submit(post_batch, "/api/v1/negotiations/bulk", SAMPLE_NEGOTIATIONS),
+        ]
+        for future in futures:
+            path, status_code, body = future.result()
+            print(f"{path}: {status_code} {body}")
+
+
+if __name__ == "__main__":
+    main()